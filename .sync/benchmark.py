@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+CV Sync Benchmarks
+Measures the stages of the CV sync and checks that the HTML backends agree
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import sync_core
+
+
+LATEX_PATH = sync_core.LATEX_PATH
+HTML_PATH = sync_core.HTML_PATH
+
+RESULTS_VERSION = 1
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def load_sources():
+    """Parse the real CV sources without touching the manifest"""
+    sources, _ = sync_core.resolve_latex_sources(LATEX_PATH)
+    return sources
+
+
+def scale_sources(sources, entries):
+    """Return a copy of ``sources`` with the repeated sections grown to ``entries`` items"""
+    scaled = copy.deepcopy(sources)
+    for name, field in [('cv/experience.tex', 'cventry'),
+                        ('cv/education.tex', 'cventry'),
+                        ('cv/certificates.tex', 'cvhonor')]:
+        items = getattr(scaled[name]['parsed'], field)
+        if items:
+            setattr(scaled[name]['parsed'], field, (items * (entries // len(items) + 1))[:entries])
+    return scaled
+
+
+def render(html_content, sources, backend):
+    """Render every section into ``html_content`` with the given backend"""
+    doc = sync_core.load_document(html_content, backend)
+    _, dirty = sync_core.plan_sections(sources, {})
+    for _, updater, data in dirty:
+        updater(doc, data)
+    return doc.serialize()
+
+
+def best_of(repeat, func):
+    """Return (best wall-clock seconds, last result) over ``repeat`` calls"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+# =============================================================================
+# Synthetic CVs
+# =============================================================================
+
+WORDS = ['platform', 'delivery', 'analytics', 'pipeline', 'roadmap', 'customers', 'risk',
+         'migration', 'Kubernetes', 'API', 'stakeholders', 'latency', 'backlog', 'data']
+
+
+def _phrase(rng, words=8):
+    """Return random LaTeX text with nested braces and escaped characters"""
+    parts = [rng.choice(WORDS) for _ in range(words)]
+    parts[rng.randrange(words)] = r'\textbf{' + rng.choice(WORDS) + '}'
+    parts[rng.randrange(words)] = rng.choice([r'R\&D', r'C\#', r'20\%', r'{\em nested {deep}}'])
+    return ' '.join(parts)
+
+
+def generate_latex_tree(path, entries, seed=0):
+    """Write a synthetic Awesome CV tree with ``entries`` items per section"""
+    rng = random.Random(seed)
+    cv_path = Path(path) / 'cv'
+    cv_path.mkdir(parents=True, exist_ok=True)
+
+    (Path(path) / 'cv.tex').write_text(
+        '\\documentclass[11pt, a4paper]{awesome-cv}\n'
+        '\\name{Ada}{Lovelace}\n'
+        '\\position{Engineer{\\enskip\\cdotp\\enskip}Analyst}\n'
+        f'\\quote{{``{_phrase(rng, 12)}"}}\n'
+        '\\begin{document}\n'
+        + ''.join(f'\\input{{cv/{name}.tex}}\n'
+                  for name in ['experience', 'education', 'skills', 'certificates',
+                               'extracurricular'])
+        + '\\end{document}\n', encoding='utf-8')
+
+    def cventry(index):
+        items = ''.join(f'        \\item {{{_phrase(rng)}}}\n' for _ in range(index % 20 + 1))
+        return (f'  \\cventry\n    {{{_phrase(rng, 3)}}} % Title\n    {{Org {index} \\& Co}}\n'
+                f'    {{City, Country}}\n    {{Jan. {2000 + index % 25} - Present}}\n'
+                f'    {{\n      \\begin{{cvitems}}\n{items}      \\end{{cvitems}}\n    }}\n')
+
+    categories = list(sync_core.SKILL_CATEGORY_MAP)
+    files = {
+        'experience': ''.join(cventry(i) for i in range(entries)),
+        'education': ''.join(cventry(i) for i in range(entries)),
+        'skills': ''.join(f'  \\cvskill\n    {{{categories[i % len(categories)]}}}\n'
+                          f'    {{{_phrase(rng, 6)}}}\n' for i in range(entries)),
+        'certificates': ''.join(f'  \\cvhonor\n    {{{_phrase(rng, 4)}}}\n    {{Issuer \\# {i}}}\n'
+                                f'    {{}}\n    {{{2000 + i % 25}}}\n' for i in range(entries)),
+        'extracurricular': '  \\cventry{Interests}{Hobbies}{}{}{\\begin{cvitems}\n'
+                           + ''.join(f'    \\item {{{_phrase(rng)}}}\n' for _ in range(entries))
+                           + '  \\end{cvitems}}\n',
+    }
+    for name, body in files.items():
+        (cv_path / f'{name}.tex').write_text(f'\\cvsection{{{name.title()}}}\n{body}',
+                                             encoding='utf-8')
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+def check_conformance(html_content, sources):
+    """Check that every backend renders a document equivalent to html.parser's"""
+    reference = sync_core.markup_tokens(render(html_content, sources, 'html.parser'))
+    failures = []
+    for backend in sync_core.HTML_BACKENDS:
+        result = sync_core.markup_tokens(render(html_content, sources, backend))
+        if result == reference:
+            print(f"  ✓ {backend}: equivalent ({len(result)} tokens)")
+            continue
+        failures.append(backend)
+        mismatch = next((i for i, (a, b) in enumerate(zip(reference, result)) if a != b),
+                        min(len(reference), len(result)))
+        print(f"  ✗ {backend}: differs at token {mismatch}")
+        print(f"      expected: {reference[mismatch] if mismatch < len(reference) else None}")
+        print(f"      got:      {result[mismatch] if mismatch < len(result) else None}")
+    return failures
+
+
+def check_search_index(html_content, sources):
+    """Check the search index against the rendered page and the entries' date ranges
+
+    Every entry id must be a ``data-id`` of the page. An entry still running
+    must be left open (``"to": null``) and not indexed under any year, so the
+    index does not change with the calendar.
+    """
+    cv = sync_core.cv_from_sources(sources)
+    index = sync_core.build_search_index(cv)
+    page_ids = re.findall(r'data-id="([^"]*)"', render(html_content, sources, 'html.parser'))
+    failures = []
+    if list(index['entries']) != page_ids:
+        failures.append('ids')
+        print(f"  ✗ ids: index {list(index['entries'])} != page {page_ids}")
+    else:
+        print(f"  ✓ ids: {len(page_ids)} entries match the page's data-id attributes")
+
+    entry = sync_core.Entry('Engineer', 'Running Co', 'Remote', "Jan. 2020 - Present")
+    running = sync_core.build_search_index(sync_core.CV(
+        personal=sync_core.PersonalInfo(), experience=[entry], education=[], skills=[],
+        trainings=[], interests=[]))
+    years = [term for term in running['terms'] if sync_core.YEAR_PATTERN.fullmatch(term)]
+    if running['entries']['exp-running-co-2020']['to'] is not None or years:
+        failures.append('years')
+        print(f"  ✗ years: a running entry is closed or indexed under {years}")
+    else:
+        print("  ✓ years: a running entry is left open and not indexed by year")
+    return failures
+
+
+def bench_backends(html_content, sources, repeat):
+    """Time parse, update and serialize for every backend"""
+    print(f"  {'backend':<12} {'parse':>10} {'update':>10} {'serialize':>10}")
+    results = {}
+    for backend in sync_core.HTML_BACKENDS:
+        parse_time, doc = best_of(repeat, lambda: sync_core.load_document(html_content, backend))
+        _, dirty = sync_core.plan_sections(sources, {})
+
+        def update():
+            fresh = sync_core.load_document(html_content, backend)
+            started = time.perf_counter()
+            for _, updater, data in dirty:
+                updater(fresh, data)
+            return time.perf_counter() - started
+
+        update_time = min(update() for _ in range(repeat))
+        serialize_time, _ = best_of(repeat, doc.serialize)
+        results[backend] = {'parse': parse_time, 'update': update_time,
+                            'serialize': serialize_time}
+        print(f"  {backend:<12} {parse_time * 1000:>8.1f}ms {update_time * 1000:>8.1f}ms "
+              f"{serialize_time * 1000:>8.1f}ms")
+    return results
+
+
+def bench_sections(html_content, sources, sizes, backend, repeat):
+    """Time the experience and education updaters as the entry count grows"""
+    print(f"  {'entries':>8} {'update':>10} {'per entry':>10}")
+    results = {}
+    for size in sizes:
+        scaled = scale_sources(sources, size)
+        page = render(html_content, scaled, 'html.parser')
+        experiences = scaled['cv/experience.tex']['parsed'].cventry
+        education = scaled['cv/education.tex']['parsed'].cventry
+
+        def update():
+            doc = sync_core.load_document(page, backend)
+            started = time.perf_counter()
+            sync_core.update_experience_section(doc, experiences)
+            sync_core.update_education_section(doc, education)
+            return time.perf_counter() - started
+
+        elapsed = min(update() for _ in range(repeat))
+        results[size] = elapsed
+        print(f"  {size:>8} {elapsed * 1000:>8.1f}ms {elapsed / (2 * size) * 1e6:>8.1f}µs")
+    return results
+
+
+PARSERS = [
+    ('scan_latex', sync_core.scan_latex, 'cv/experience.tex'),
+    ('parse_personal_info', sync_core.parse_personal_info, 'cv.tex'),
+    ('parse_cventry', sync_core.parse_cventry, 'cv/experience.tex'),
+    ('parse_cvskill', sync_core.parse_cvskill, 'cv/skills.tex'),
+    ('parse_cvhonor', sync_core.parse_cvhonor, 'cv/certificates.tex'),
+    ('parse_interests', sync_core.parse_interests, 'cv/extracurricular.tex'),
+]
+
+
+def bench_suite(sizes, backend, repeat):
+    """Time every parser, every updater and the full sync on synthetic CVs"""
+    template = HTML_PATH.read_text(encoding='utf-8')
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            latex_path = Path(tmp) / f'cv-{size}'
+            generate_latex_tree(latex_path, size)
+            page = sync_core.render_cv(latex_path, template, backend)
+            timings = {}
+
+            for name, parser, source in PARSERS:
+                content = sync_core.read_latex_file(latex_path / source)
+                timings[name], _ = best_of(repeat, lambda: parser(content))
+
+            sources, _ = sync_core.resolve_latex_sources(latex_path)
+            timings['parse_html'], doc = best_of(
+                repeat, lambda: sync_core.load_document(page, backend))
+            timings['serialize'], _ = best_of(repeat, doc.serialize)
+            for section, source, field, updater in sync_core.SECTIONS:
+                data = getattr(sources[source]['parsed'], field)
+                best = float('inf')
+                for _ in range(repeat):
+                    doc = sync_core.load_document(page, backend)
+                    started = time.perf_counter()
+                    updater(doc, data)
+                    best = min(best, time.perf_counter() - started)
+                timings[updater.__name__] = best
+
+            def full_sync():
+                html_path = Path(tmp) / 'index.html'
+                state_path = Path(tmp) / 'state'
+                html_path.write_text(template, encoding='utf-8')
+                shutil.rmtree(state_path, ignore_errors=True)
+                state_path.mkdir()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    sync_core.sync(force=True, backend=backend, latex_path=latex_path,
+                                   html_path=html_path, state_path=state_path)
+
+            timings['sync'], _ = best_of(repeat, full_sync)
+            results[str(size)] = timings
+            print(f"  {size:>6} entries: parse_cventry {timings['parse_cventry'] * 1000:.1f}ms, "
+                  f"update_experience_section {timings['update_experience_section'] * 1000:.1f}ms, "
+                  f"sync {timings['sync'] * 1000:.1f}ms")
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'backend': backend,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def peak_memory(func):
+    """Run ``func`` once and return (seconds, peak traced bytes)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        func()
+        return time.perf_counter() - started, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_stream(sizes):
+    """Compare peak memory of the DOM render with the streaming splice render"""
+    template = HTML_PATH.read_text(encoding='utf-8')
+    print(f"  {'entries':>8} {'source':>9} {'dom peak':>10} {'stream peak':>12} {'stream':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            latex_path = Path(tmp) / f'cv-{size}'
+            generate_latex_tree(latex_path, size)
+            source_bytes = sum(path.stat().st_size for path in latex_path.rglob('*.tex'))
+            dom_path = Path(tmp) / 'dom.html'
+            stream_path = Path(tmp) / 'stream.html'
+            _, dom_peak = peak_memory(lambda: dom_path.write_text(
+                sync_core.render_cv(latex_path, template), encoding='utf-8'))
+            seconds, stream_peak = peak_memory(
+                lambda: sync_core.render_cv_stream(latex_path, template, stream_path))
+            same = ('' if dom_path.read_bytes() == stream_path.read_bytes()
+                    else '  ✗ output differs')
+            print(f"  {size:>8} {source_bytes / 2**20:>7.1f}MB {dom_peak / 2**20:>8.1f}MB "
+                  f"{stream_peak / 2**20:>10.1f}MB {seconds * 1000:>7.0f}ms{same}")
+
+
+def compare_to_baseline(report, baseline, tolerance, floor=0.001):
+    """Return the metrics that got slower than ``baseline`` by more than ``tolerance``
+
+    Differences below ``floor`` seconds are treated as noise.
+    """
+    regressions = []
+    for size, timings in report['results'].items():
+        for metric, seconds in timings.items():
+            before = baseline.get('results', {}).get(size, {}).get(metric)
+            if before is None:
+                continue
+            if seconds > before * (1 + tolerance) and seconds - before > floor:
+                regressions.append((size, metric, before, seconds))
+    return regressions
+
+
+# Commands that must start on the standard library alone, run in a scratch copy
+STARTUP_COMMANDS = [['--list-backups'], ['--check'], []]
+
+# Modules those commands must not import
+HEAVY_MODULES = ['bs4', 'lxml', 'concurrent.futures', 'subprocess', 'tracemalloc',
+                 'sync_publish', 'sync_pdf']
+
+
+def import_times(args, cwd, env):
+    """Run ``python -X importtime ARGS`` and return (top-level import µs by module, modules)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=cwd, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    top_level = {}
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        modules.add(name.strip())
+        if not name.startswith('  '):
+            top_level[name.strip()] = int(cumulative)
+    return top_level, modules
+
+
+def bench_startup(repeat, budget):
+    """Time the imports of the stdlib-only commands and check them against ``budget`` ms
+
+    Bytecode is cached in a scratch directory first, as it is after the
+    first run in a checkout. Only imports made by sync_cv.py count, not
+    those of the interpreter's own startup. Returns the failed checks.
+    """
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'site'
+        shutil.copytree(LATEX_PATH, root / LATEX_PATH.relative_to(sync_core.BASE_PATH))
+        shutil.copytree(sync_core.BASE_PATH / sync_core.IMAGE_DIR, root / sync_core.IMAGE_DIR)
+        shutil.copy(HTML_PATH, root / HTML_PATH.name)
+        (root / '.sync').mkdir()
+        for module in Path(__file__).parent.glob('sync_*.py'):
+            shutil.copy(module, root / '.sync' / module.name)
+        env = dict(os.environ)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        cached = ['-X', f'pycache_prefix={tmp}/pycache']
+        script = ['.sync/sync_cv.py']
+        interpreter, _ = import_times(cached + ['-c', 'pass'], root, env)
+        # Warm the bytecode cache and the manifest, so [] is the no-op sync
+        subprocess.run([sys.executable, *cached, *script], cwd=root, env=env,
+                       capture_output=True, check=True)
+
+        print(f"  {'command':<16} {'imports':>9} {'wall':>9}")
+        for args in STARTUP_COMMANDS:
+            best_import = best_wall = float('inf')
+            for _ in range(repeat):
+                started = time.perf_counter()
+                top_level, modules = import_times(cached + script + args, root, env)
+                best_wall = min(best_wall, time.perf_counter() - started)
+                best_import = min(best_import, sum(
+                    micros for name, micros in top_level.items() if name not in interpreter))
+            heavy = sorted(name for name in modules
+                           if any(name == module or name.startswith(module + '.')
+                                  for module in HEAVY_MODULES))
+            label = ' '.join(args) or '(up to date)'
+            status = '✓'
+            if heavy:
+                status = f"✗ imports {', '.join(heavy)}"
+                failures.append(label)
+            elif best_import / 1000 > budget:
+                status = f"✗ over the {budget:g} ms budget"
+                failures.append(label)
+            print(f"  {label:<16} {best_import / 1000:>7.1f}ms "
+                  f"{best_wall * 1000:>7.0f}ms  {status}")
+    return failures
+
+
+# =============================================================================
+# Main Function
+# =============================================================================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark and check the CV sync")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('conformance', help="check that all HTML backends agree on index.html")
+
+    backends = commands.add_parser('backends', help="time parse/update/serialize per backend")
+    backends.add_argument('--entries', type=int, default=500,
+                          help="experience/education/certificate entries on the page")
+    backends.add_argument('--repeat', type=int, default=3, help="runs per measurement")
+
+    sections = commands.add_parser('sections',
+                                   help="time the experience/education updaters as entries grow")
+    sections.add_argument('--sizes', type=int, nargs='+', default=[100, 200, 400, 800],
+                          help="entries per section to measure")
+    sections.add_argument('--backend', choices=sorted(sync_core.HTML_BACKENDS),
+                          default='html.parser')
+    sections.add_argument('--repeat', type=int, default=3, help="runs per measurement")
+
+    suite = commands.add_parser('suite',
+                                help="time every parse/update stage and sync on synthetic CVs")
+    suite.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                       help="entries per section in the generated CVs")
+    suite.add_argument('--backend', choices=sorted(sync_core.HTML_BACKENDS), default='html.parser')
+    suite.add_argument('--repeat', type=int, default=3, help="runs per measurement")
+    suite.add_argument('--output', metavar='JSON', help="write the results to this file")
+    suite.add_argument('--baseline', metavar='JSON',
+                       help="fail if any stage is slower than in this earlier result file")
+    suite.add_argument('--tolerance', type=float, default=0.25,
+                       help="allowed slowdown against the baseline (default: 0.25 = 25%%)")
+
+    stream = commands.add_parser('stream',
+                                 help="peak memory of the DOM render vs the streaming render")
+    stream.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="entries per section in the generated CVs")
+
+    startup = commands.add_parser('startup',
+                                  help="check the import time of the stdlib-only commands")
+    startup.add_argument('--budget', type=float, default=100,
+                         help="import time allowed per command in ms (default: 100)")
+    startup.add_argument('--repeat', type=int, default=5, help="runs per command")
+
+    args = parser.parse_args(argv)
+    if args.command == 'suite':
+        print(f"Sync stages on synthetic CVs ({args.backend})")
+        report = bench_suite(args.sizes, args.backend, args.repeat)
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+            print(f"✓ Results written to {args.output}")
+        if args.baseline:
+            baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+            regressions = compare_to_baseline(report, baseline, args.tolerance)
+            for size, metric, before, after in regressions:
+                print(f"  ✗ {metric} at {size} entries: "
+                      f"{before * 1000:.1f}ms → {after * 1000:.1f}ms")
+            if regressions:
+                sys.exit(1)
+            print(f"✓ No stage slower than the baseline by more than {args.tolerance:.0%}")
+        return
+
+    if args.command == 'startup':
+        print("Startup imports of sync_cv.py (best of {})".format(args.repeat))
+        failures = bench_startup(args.repeat, args.budget)
+        sys.exit(1 if failures else 0)
+
+    if args.command == 'stream':
+        print("Render peak memory on synthetic CVs")
+        bench_stream(args.sizes)
+        return
+
+    html_content = HTML_PATH.read_text(encoding='utf-8')
+    sources = load_sources()
+
+    if args.command == 'conformance':
+        print("HTML backend conformance (index.html)")
+        failures = check_conformance(html_content, sources)
+        print("\nSearch index conformance")
+        failures += check_search_index(html_content, sources)
+        sys.exit(1 if failures else 0)
+
+    if args.command == 'backends':
+        scaled = scale_sources(sources, args.entries)
+        page = render(html_content, scaled, 'html.parser')
+        print(f"HTML backends on a {len(page) // 1024} KB page "
+              f"({args.entries} entries per section)")
+        bench_backends(page, scaled, args.repeat)
+
+    if args.command == 'sections':
+        print(f"Experience + education updaters ({args.backend})")
+        bench_sections(html_content, sources, args.sizes, args.backend, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
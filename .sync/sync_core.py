@@ -0,0 +1,2967 @@
+"""
+CV Synchronization Core
+Parses the LaTeX CV and renders it into index.html with the DOM or splice engine
+
+Only the standard library is imported up front. bs4 and lxml are imported by
+the HTML backends when a page is first parsed, and the heavier standard
+modules by the functions that use them, so the read-only commands stay fast.
+"""
+
+import contextlib
+import copy
+import functools
+import gzip
+import hashlib
+import html
+import itertools
+import json
+import mmap
+import os
+import posixpath
+import re
+import struct
+import sys
+import tempfile
+import time
+import unicodedata
+from collections import namedtuple
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from datetime import datetime
+
+
+# Default locations: the repo root, the CV sources, the page and the sync state
+BASE_PATH = Path(__file__).parent.parent
+LATEX_PATH = BASE_PATH / '.awesome-CV' / 'myCV'
+HTML_PATH = BASE_PATH / 'index.html'
+STATE_PATH = Path(__file__).parent
+RELEASE_PATH = BASE_PATH / 'dist'
+
+
+# =============================================================================
+# CV Model
+# =============================================================================
+
+@dataclass(slots=True)
+class PersonalInfo:
+    """Name, position and summary quote from cv.tex"""
+    first_name: str = ''
+    last_name: str = ''
+    position: str = ''
+    quote: str = ''
+
+
+@dataclass(slots=True)
+class Entry:
+    """One \\cventry: a job, a degree or an activity"""
+    title: str
+    org: str
+    location: str
+    dates: str
+    items: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Skill:
+    """One \\cvskill: a category and its comma-separated skills"""
+    category: str
+    skills: str
+
+
+@dataclass(slots=True)
+class Honor:
+    """One \\cvhonor: a certificate or training"""
+    name: str
+    issuer: str
+    id: str
+    date: str
+
+
+@dataclass(slots=True)
+class LatexStream:
+    """The ``name`` macros of a large LaTeX file, parsed again on every iteration
+
+    Stands in for the lists of a ParsedSource when the file is streamed, so
+    neither memory nor the manifest ever holds all of its entries. ``hash``
+    is the file's, so the section fingerprints still follow its content.
+    """
+    path: str
+    name: str
+    hash: str
+
+    def __iter__(self):
+        return iter_latex_entries(self.path, self.name)
+
+
+@dataclass(slots=True)
+class ParsedSource:
+    """Everything parsed from one LaTeX file; ``personal`` only for the root"""
+    inputs: list[str]
+    cventry: list[Entry] | LatexStream
+    cvskill: list[Skill] | LatexStream
+    cvhonor: list[Honor] | LatexStream
+    item: list[str] | LatexStream
+    personal: PersonalInfo | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a ParsedSource from its asdict() form"""
+        def entries(value, model):
+            if isinstance(value, dict):
+                return LatexStream(**value)
+            return [model(**entry) for entry in value] if model else value
+
+        personal = data.get('personal')
+        return cls(
+            inputs=data['inputs'],
+            cventry=entries(data['cventry'], Entry),
+            cvskill=entries(data['cvskill'], Skill),
+            cvhonor=entries(data['cvhonor'], Honor),
+            item=entries(data['item'], None),
+            personal=PersonalInfo(**personal) if personal else None,
+        )
+
+    def streamed_from(self):
+        """Return the path the entries are streamed from, or None if they are parsed"""
+        return self.cventry.path if isinstance(self.cventry, LatexStream) else None
+
+
+@dataclass(slots=True)
+class CV:
+    """The whole CV, assembled from the parsed sources of a LaTeX tree"""
+    personal: PersonalInfo
+    experience: list[Entry]
+    education: list[Entry]
+    skills: list[Skill]
+    trainings: list[Honor]
+    interests: list[str]
+
+
+def model_json(obj):
+    """json.dumps ``default`` hook that serializes the model dataclasses"""
+    return asdict(obj)
+
+
+# =============================================================================
+# LaTeX Parsing Functions
+# =============================================================================
+
+# Text produced by control words and control symbols. Commands missing here
+# (\textbf, \emph, ...) are dropped and their argument is kept as plain text;
+# spacing commands such as \enskip and \\ collapse with the whitespace around them.
+LATEX_COMMANDS = {
+    'cdotp': '·', 'cdot': '·', 'textbullet': '•', 'ldots': '…', 'dots': '…',
+    'textendash': '–', 'textemdash': '—', 'textasciitilde': '~', 'sim': '~',
+    'textbar': '|', 'textbackslash': '\\', 'textdegree': '°', 'texteuro': '€',
+    'pounds': '£', 'copyright': '©', 'textregistered': '®', 'texttrademark': '™',
+    'LaTeX': 'LaTeX', 'TeX': 'TeX',
+    'l': 'ł', 'L': 'Ł', 'o': 'ø', 'O': 'Ø', 'ss': 'ß', 'ae': 'æ', 'AE': 'Æ',
+    'oe': 'œ', 'OE': 'Œ', 'aa': 'å', 'AA': 'Å', 'i': 'ı', 'j': 'ȷ',
+}
+LATEX_SYMBOLS = {'-': ''}
+
+# Combining marks for the accent commands: \'e, \"o, \v{z}, \c{c}, ...
+LATEX_ACCENTS = {
+    "'": '\u0301', '`': '\u0300', '^': '\u0302', '"': '\u0308', '~': '\u0303',
+    '=': '\u0304', '.': '\u0307', 'u': '\u0306', 'v': '\u030c', 'H': '\u030b',
+    'c': '\u0327', 'k': '\u0328', 'r': '\u030a',
+}
+
+# Commands whose first argument is not text, e.g. the URL of \href{url}{text}
+LATEX_DROPPED_ARGS = ('href', 'hspace', 'vspace', 'fontsize')
+
+LATEX_TEXT_PATTERN = re.compile(r"""
+    (?P<space>(?:[ \t\n\r\f\v]|\\[\\ ,;]|\\(?:enskip|quad|qquad|space|newline)(?![a-zA-Z]))+)
+  | \\(?P<accent>['`^"~=.])\s*(?:\{(?P<braced>\\[ij]|\w)\}|(?P<bare>\\[ij](?![a-zA-Z])|\w))
+  | \\(?P<letter_accent>[uvHckr])(?:\{(?P<letter_braced>\\[ij]|\w)\}|\s+(?P<letter_bare>\w))
+  | \\(?:""" + '|'.join(LATEX_DROPPED_ARGS) + r""")\*?\s*\{[^{}]*\}
+  | \\(?P<command>[a-zA-Z]+)\*?[ \t\n\r\f\v]*
+  | \\(?P<symbol>.)
+  | (?P<dash>---?)
+  | (?P<quote>``|'')
+  | (?P<tie>~)
+  | [{}$]
+""", re.VERBOSE | re.DOTALL)
+
+
+def _translate_latex(match):
+    kind = match.lastgroup
+    if kind in ('braced', 'bare', 'letter_braced', 'letter_bare'):
+        accent = match.group('accent') or match.group('letter_accent')
+        # \i and \j are the dotless letters accents go on: \'{\i} is í
+        letter = match.group(kind)[-1]
+        return unicodedata.normalize('NFC', letter + LATEX_ACCENTS[accent])
+    if kind == 'command':
+        return LATEX_COMMANDS.get(match.group('command'), '')
+    if kind == 'symbol':
+        symbol = match.group('symbol')
+        return LATEX_SYMBOLS.get(symbol, symbol)
+    if kind == 'dash':
+        return '—' if match.group('dash') == '---' else '–'
+    if kind == 'quote':
+        return '“' if match.group('quote') == '``' else '”'
+    if kind == 'tie':
+        return '\xa0'
+    if kind == 'space':
+        return ' '
+    return ''
+
+
+@functools.lru_cache(maxsize=4096)
+def clean_latex(text):
+    """Translate a LaTeX fragment to plain text in one pass
+
+    Accents become precomposed characters, ``~`` a non-breaking space and
+    formatting commands are dropped around their text. Only ASCII whitespace
+    is collapsed, so the non-breaking spaces survive. Results are memoized,
+    since dates, locations and organizations repeat across entries.
+    """
+    if not text:
+        return ""
+    return LATEX_TEXT_PATTERN.sub(_translate_latex, text).strip(' ')
+
+
+def read_latex_file(path):
+    """Read a LaTeX file and return its content"""
+    return Path(path).read_text(encoding='utf-8')
+
+
+def parse_personal_info(content):
+    """Extract personal information from cv.tex"""
+    first = re.search(r'\\name\{([^}]+)\}\{([^}]+)\}', content)
+
+    # Extract position with nested braces support
+    position_match = re.search(r'\\position\{((?:[^{}]|\\[{}]|{[^}]*})*)\}', content)
+    position_text = ''
+    if position_match:
+        position_text = position_match.group(1)
+        # Replace {\enskip\cdotp\enskip} with comma
+        position_text = position_text.replace(r'{\enskip\cdotp\enskip}', ', ')
+
+    quote = re.search(r'\\quote\{``([^"]+)"', content)
+
+    return PersonalInfo(
+        first_name=first.group(1) if first else '',
+        last_name=first.group(2) if first else '',
+        position=clean_latex(position_text),
+        quote=clean_latex(quote.group(1)) if quote else '',
+    )
+
+
+# Arity of every LaTeX macro the sync understands. The lexer reads exactly
+# this many brace-delimited arguments after each macro name.
+LATEX_MACROS = {
+    'cventry': 5,
+    'cvskill': 2,
+    'cvhonor': 4,
+    'item': 1,
+}
+
+LatexNode = namedtuple('LatexNode', ['name', 'args', 'children'])
+
+
+def _flat_macros(macros):
+    """Return the ``(name, arity)`` of the macros with a one-token fast path, in group order"""
+    return [(name, arity) for name, arity in sorted(macros.items()) if arity]
+
+
+def _macro_token_pattern(macros, binary=False):
+    """Build the token regex for the given macro names, for str or bytes input"""
+    names = '|'.join(sorted(macros, key=len, reverse=True))
+    command = r'(?![A-Za-z@])'
+    # A macro whose arguments hold no comments, known macros or braces nested
+    # more than two deep is matched whole, with one group per argument
+    # (plain runs, then escapes or groups each followed by a plain run, so a
+    # failed match backtracks at most once per character)
+    plain = r'[^{}\\%]*'
+    escape = r'\\(?!(?:' + names + ')' + command + r')[\s\S]'
+    nested = plain + r'(?:' + escape + plain + r')*'
+    for _ in range(2):
+        nested = plain + r'(?:(?:' + escape + r'|\{' + nested + r'\})' + plain + r')*'
+    flat_arg = r'\s*\{(' + nested + r')\}'
+    flat = [r'\\' + re.escape(name) + command + flat_arg * arity
+            for name, arity in _flat_macros(macros)]
+    # Then the last four groups: a known macro, an opening brace, a closing
+    # brace and a comment. The escapes that would otherwise be read as one
+    # of those (\{, \}, \%, \\) are matched without a group; other commands
+    # are text. Every branch starts with a literal, which lets re skip ahead
+    # to the next \, {, } or %, so the groups of the last three are empty.
+    tokens = r'\\(?:(' + names + ')' + command + r'|[\\{}%])|\{()|\}()|%()[^\n]*'
+    pattern = '|'.join([*flat, tokens])
+    return re.compile(pattern.encode('ascii') if binary else pattern)
+
+
+_LATEX_TOKEN = _macro_token_pattern(LATEX_MACROS)
+_LATEX_TOKEN_BYTES = _macro_token_pattern(LATEX_MACROS, binary=True)
+
+
+def _iter_scan(content, pattern, macros):
+    """Yield the top-level macro nodes of ``content`` as soon as each one is complete
+
+    ``content`` is a str, or a bytes-like buffer such as an mmap scanned with
+    a bytes ``pattern``; then only the argument slices are decoded. The hot
+    loop only counts braces: a node is touched when a macro starts, when
+    one of its arguments opens or closes, and while it waits for the next.
+    A macro the token regex matches whole, arguments included, is built
+    from that one token.
+    """
+    binary = not isinstance(content, str)
+    arities = {name.encode('ascii') if binary else name: (name, arity)
+               for name, arity in macros.items()}
+    # Whole-macro tokens by their last group: (name, offset of the first group, arity)
+    flat = {}
+    group = 0
+    for name, arity in _flat_macros(macros):
+        flat[group + arity] = (name, group, arity)
+        group += arity
+    macro_kind, open_kind, close_kind, comment_kind = range(group + 1, group + 5)
+    # Open nodes: [name, arity, args, children, depth of the open arg, its start]
+    stack = []
+    depth = 0
+    # Depth of the innermost open argument, if any
+    arg_depth = None
+    # The top node is between two arguments; ``last`` is where it got there
+    waiting = False
+    last = 0
+
+    for match in pattern.finditer(content):
+        kind = match.lastindex
+        if waiting:
+            waiting = False
+            start = match.start()
+            # Only whitespace and comments may come before the next argument
+            if (kind != open_kind and kind != comment_kind
+                    or last != start and not content[last:start].isspace()):
+                stack.pop()
+                arg_depth = stack[-1][4] if stack else None
+            elif kind == comment_kind:
+                waiting = True
+                last = match.end()
+                continue
+            else:
+                depth += 1
+                node = stack[-1]
+                node[4] = arg_depth = depth
+                node[5] = match.end()
+                continue
+
+        if kind == close_kind:
+            if depth == arg_depth:
+                node = stack[-1]
+                arg = content[node[5]:match.start()].strip()
+                node[2].append(arg.decode('utf-8') if binary else arg)
+                if len(node[2]) < node[1]:
+                    waiting = True
+                    last = match.end()
+                else:
+                    stack.pop()
+                    arg_depth = stack[-1][4] if stack else None
+                    latex_node = LatexNode(node[0], tuple(node[2]), node[3])
+                    if stack:
+                        stack[-1][3].append(latex_node)
+                    else:
+                        yield latex_node
+            depth -= 1
+        elif kind == open_kind:
+            depth += 1
+        elif kind in flat:
+            name, group, arity = flat[kind]
+            args = match.groups()[group:group + arity]
+            if binary:
+                args = tuple(arg.strip().decode('utf-8') for arg in args)
+            else:
+                args = tuple(arg.strip() for arg in args)
+            latex_node = LatexNode(name, args, [])
+            if stack:
+                stack[-1][3].append(latex_node)
+            else:
+                yield latex_node
+        elif kind == macro_kind:
+            name, arity = arities[match.group(kind)]
+            stack.append([name, arity, [], [], None, 0])
+            waiting = True
+            last = match.end()
+
+
+def scan_latex(content, macros=None):
+    """Tokenize LaTeX source in a single pass and return the macro nodes found.
+
+    Every macro listed in ``macros`` (defaults to LATEX_MACROS) becomes a
+    LatexNode whose ``args`` are the brace-balanced argument texts, sliced
+    straight from ``content``. Macros nested inside an argument (e.g. \\item
+    inside \\cventry) are attached to ``children`` of the enclosing node.
+    Only whitespace and comments may separate a macro from its arguments;
+    a macro without its full set of arguments is dropped.
+    """
+    if macros is None:
+        macros, pattern = LATEX_MACROS, _LATEX_TOKEN
+    else:
+        pattern = _macro_token_pattern(macros)
+    return list(_iter_scan(content, pattern, macros))
+
+
+def scan_latex_file(path, macros=None):
+    """Yield the top-level macro nodes of a LaTeX file without reading it into a str
+
+    The file is memory-mapped and tokenized as bytes, so memory holds only
+    the node being built. Nodes are the same as scan_latex() returns.
+    """
+    if macros is None:
+        macros, pattern = LATEX_MACROS, _LATEX_TOKEN_BYTES
+    else:
+        pattern = _macro_token_pattern(macros, binary=True)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from _iter_scan(mapped, pattern, macros)
+
+
+def iter_latex_nodes(nodes, name):
+    """Yield every node called ``name`` from a node tree, in document order"""
+    for node in nodes:
+        if node.name == name:
+            yield node
+        yield from iter_latex_nodes(node.children, name)
+
+
+def _items(node):
+    """Return the cleaned, non-empty \\item texts nested in a node"""
+    return [clean_latex(item.args[0]) for item in iter_latex_nodes(node.children, 'item')
+            if item.args[0]]
+
+
+def _entry(node):
+    """Build an Entry from a \\cventry node"""
+    return Entry(
+        title=clean_latex(node.args[0]),
+        org=clean_latex(node.args[1]),
+        location=clean_latex(node.args[2]),
+        dates=clean_latex(node.args[3]),
+        items=_items(node),
+    )
+
+
+def _skill(node):
+    """Build a Skill from a \\cvskill node"""
+    return Skill(
+        category=clean_latex(node.args[0]),
+        skills=clean_latex(node.args[1]),
+    )
+
+
+def _honor(node):
+    """Build an Honor from a \\cvhonor node"""
+    return Honor(
+        name=clean_latex(node.args[0]),
+        issuer=clean_latex(node.args[1]),
+        id=clean_latex(node.args[2]),
+        date=clean_latex(node.args[3]),
+    )
+
+
+def parse_cventry(content):
+    """Extract cventry{}{}{}{}{} blocks from LaTeX"""
+    nodes = content if isinstance(content, list) else scan_latex(content)
+    return [_entry(node) for node in iter_latex_nodes(nodes, 'cventry')]
+
+
+def parse_cvskill(content):
+    """Extract cvskill{}{} blocks from LaTeX"""
+    nodes = content if isinstance(content, list) else scan_latex(content)
+    return [_skill(node) for node in iter_latex_nodes(nodes, 'cvskill')]
+
+
+def parse_cvhonor(content):
+    """Extract cvhonor{}{}{}{} blocks from LaTeX"""
+    nodes = content if isinstance(content, list) else scan_latex(content)
+    return [_honor(node) for node in iter_latex_nodes(nodes, 'cvhonor')]
+
+
+def parse_interests(content):
+    """Extract interest items from extracurricular.tex"""
+    nodes = content if isinstance(content, list) else scan_latex(content)
+    return [clean_latex(node.args[0]) for node in iter_latex_nodes(nodes, 'item') if node.args[0]]
+
+
+# Model builder for each parsed field, used by the streaming parser
+LATEX_BUILDERS = {
+    'cventry': _entry,
+    'cvskill': _skill,
+    'cvhonor': _honor,
+    'item': lambda node: clean_latex(node.args[0]) if node.args[0] else None,
+}
+
+
+def iter_latex_entries(path, name):
+    """Yield the models of every ``name`` macro in a LaTeX file, one at a time
+
+    The streaming counterpart of parse_cventry() and friends: the file is
+    memory-mapped and each entry is built as soon as its macro closes.
+    """
+    build = LATEX_BUILDERS[name]
+    for node in scan_latex_file(path):
+        for match in iter_latex_nodes([node], name):
+            entry = build(match)
+            if entry is not None:
+                yield entry
+
+
+# =============================================================================
+# Search Index
+# =============================================================================
+
+# Written next to index.html for js/main.js; bump the version on format changes
+SEARCH_INDEX = 'search-index.json'
+SEARCH_INDEX_VERSION = 2
+
+# Entry sections that get data-id attributes, and the prefix of their ids
+ENTRY_ID_PREFIXES = {
+    'experience': 'exp',
+    'education': 'edu',
+}
+
+# Sections whose data goes into the index
+SEARCH_SECTIONS = (*ENTRY_ID_PREFIXES, 'skills')
+
+SEARCH_STOPWORDS = frozenset({'a', 'an', 'and', 'as', 'at', 'by', 'for', 'from', 'in', 'into',
+                              'of', 'on', 'or', 'the', 'to', 'with'})
+SEARCH_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+# Letters NFKD does not decompose into an ASCII base
+SEARCH_FOLD = str.maketrans({'ł': 'l', 'Ł': 'L', 'ø': 'o', 'Ø': 'O', 'ß': 'ss', 'đ': 'd'})
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+
+
+def normalize_terms(text):
+    """Split text into lowercase, accent-free search tokens"""
+    text = unicodedata.normalize('NFKD', text.translate(SEARCH_FOLD))
+    return SEARCH_TOKEN_PATTERN.findall(text.encode('ascii', 'ignore').decode('ascii').lower())
+
+
+def entry_years(dates):
+    """Return ``(from, to)`` years of an entry's dates; ``to`` is None for Present"""
+    years = [int(year) for year in YEAR_PATTERN.findall(dates)]
+    if not years:
+        return None, None
+    if len(years) == 1 and 'present' in dates.lower():
+        return years[0], None
+    return years[0], years[-1]
+
+
+def iter_entry_ids(section, entries):
+    """Yield ``(entry, id)`` for the entries of a section in ENTRY_ID_PREFIXES
+
+    The id is the section prefix, the organization and the start year, e.g.
+    ``exp-sii-polska-2023``, so it survives reordering and edits to the other
+    fields. Repeated ids get a numeric suffix.
+    """
+    seen = {}
+    for entry in entries:
+        start, _ = entry_years(entry.dates)
+        parts = [ENTRY_ID_PREFIXES[section], *normalize_terms(entry.org), str(start or '')]
+        base = '-'.join(part for part in parts if part)
+        seen[base] = seen.get(base, 0) + 1
+        yield entry, base if seen[base] == 1 else f"{base}-{seen[base]}"
+
+
+def build_search_index(cv):
+    """Build the inverted index of the experience and education entries
+
+    Terms are the normalized words of each entry, every year of a finished
+    entry's range and the skills from skills.tex it mentions, as space-joined
+    phrases. An entry still running has ``'to': None`` and its range is left
+    to the search, so the index does not change with the calendar. Returns
+    ``{'version', 'entries', 'skills', 'stopwords', 'terms'}``: the entries
+    by id with their section, title, organization and years, the category of
+    every indexed skill, the words left out of the terms, so queries can
+    drop them too, and the ids of the entries matching each term.
+    """
+    skills = {}
+    for skill in cv.skills:
+        for phrase in skill.skills.split(','):
+            tokens = normalize_terms(phrase)
+            if tokens:
+                skills.setdefault(' '.join(tokens), skill.category)
+
+    entries = {}
+    terms = {}
+    for section in ENTRY_ID_PREFIXES:
+        for entry, entry_id in iter_entry_ids(section, getattr(cv, section)):
+            start, end = entry_years(entry.dates)
+            entries[entry_id] = {'section': section, 'title': entry.title, 'org': entry.org,
+                                 'from': start, 'to': end}
+            tokens = normalize_terms(' '.join([entry.title, entry.org, entry.location,
+                                               *entry.items]))
+            # Bare numbers are noise, except the years mentioned in the text
+            found = {token for token in tokens
+                     if len(token) > 1 and token not in SEARCH_STOPWORDS
+                     and (not token.isdigit() or YEAR_PATTERN.fullmatch(token))}
+            if start and end:
+                found.update(str(spanned) for spanned in range(start, end + 1))
+            text = f" {' '.join(tokens)} "
+            found.update(phrase for phrase in skills if f" {phrase} " in text)
+            for term in found:
+                terms.setdefault(term, []).append(entry_id)
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'entries': entries,
+        'skills': {phrase: category for phrase, category in skills.items() if phrase in terms},
+        'stopwords': sorted(SEARCH_STOPWORDS),
+        'terms': dict(sorted(terms.items())),
+    }
+
+
+def render_search_index(cv):
+    """Serialize the search index as compact JSON"""
+    return json.dumps(build_search_index(cv), ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def update_search_index(cv, path):
+    """Rewrite the search index at ``path`` if it changed; return whether it was written"""
+    text = render_search_index(cv)
+    if text_unchanged(path, text):
+        return False
+    write_text_atomic(path, text)
+    return True
+
+
+# =============================================================================
+# HTML Backends
+# =============================================================================
+
+# Void in HTML5 but not to libxml2's HTML 4 parser, which nests the following
+# siblings inside them and serializes them with end tags
+LXML_VOID_TAGS = ('embed', 'source', 'track', 'wbr')
+LXML_VOID_END_PATTERN = re.compile(r'</(?:' + '|'.join(LXML_VOID_TAGS) + r')\s*>')
+
+
+class SoupDocument:
+    """index.html parsed by BeautifulSoup with the 'html.parser' or 'lxml' builder"""
+
+    index = None
+
+    def __init__(self, html_content, parser='html.parser'):
+        from bs4 import BeautifulSoup  # type: ignore[import-untyped]
+        self.root = BeautifulSoup(html_content, parser)
+        if parser == 'lxml':
+            # The content libxml2 nests into HTML5 void elements belongs after them
+            for element in self.root.find_all(LXML_VOID_TAGS):
+                for child in reversed(list(element.contents)):
+                    element.insert_after(child.extract())
+
+    def find(self, tag, attrs=None, within=None):
+        return (self.root if within is None else within).find(tag, attrs or {})
+
+    def find_all(self, tag, attrs=None, within=None):
+        return (self.root if within is None else within).find_all(tag, attrs or {})
+
+    def find_next_sibling(self, node, tag=None, attrs=None):
+        return node.find_next_sibling(tag, attrs or {})
+
+    def matches(self, node, tag, attrs=None):
+        if node.name != tag:
+            return False
+        for name, value in (attrs or {}).items():
+            actual = node.get(name)
+            if actual is None or (value is not True and value != actual
+                                  and not (isinstance(actual, list) and value in actual)):
+                return False
+        return True
+
+    def tag_name(self, node):
+        return node.name
+
+    def get_text(self, node):
+        return node.string
+
+    def get_attr(self, node, name):
+        return node.get(name)
+
+    def parent(self, node):
+        parent = node.parent
+        return None if parent is None or parent is self.root else parent
+
+    def descendants(self, node):
+        return node.find_all(True)
+
+    def set_text(self, node, text):
+        node.string = text
+
+    def set_attr(self, node, name, value):
+        node[name] = value
+
+    def new_element(self, tag, attrs=None, text=None):
+        element = self.root.new_tag(tag, attrs=attrs or {})
+        if text is not None:
+            element.string = text
+        return element
+
+    def append(self, parent, child):
+        parent.append(child)
+
+    def insert_after(self, node, new_nodes):
+        node.insert_after(*new_nodes)
+
+    def insert_before(self, node, new_nodes):
+        if new_nodes:
+            node.insert_before(*new_nodes)
+
+    def wrap(self, node, tag):
+        return node.wrap(self.root.new_tag(tag))
+
+    def remove(self, node):
+        node.decompose()
+
+    def clone(self, node):
+        return copy.copy(node)
+
+    def clear(self, node):
+        node.clear()
+
+    def copy_document(self):
+        """Return an independent copy of the whole document, without reparsing"""
+        document = object.__new__(SoupDocument)
+        document.root = copy.copy(self.root)
+        return document
+
+    def serialize(self):
+        return str(self.root)
+
+
+class LxmlDocument:
+    """index.html parsed by lxml.html, without BeautifulSoup"""
+
+    index = None
+
+    def __init__(self, html_content):
+        import lxml.html  # type: ignore[import-untyped]
+        self._lxml_html = lxml.html
+        self.root = lxml.html.document_fromstring(html_content)
+        self._unnest_void_elements()
+
+    def _unnest_void_elements(self):
+        """Move the content libxml2 nested into HTML5 void elements back after them"""
+        for element in list(self.root.iter(*LXML_VOID_TAGS)):
+            children = list(element)
+            if not children and not element.text:
+                continue
+            parent = element.getparent()
+            position = parent.index(element)
+            tail, element.tail, element.text = element.tail, element.text, None
+            parent[position + 1:position + 1] = children
+            last = children[-1] if children else element
+            last.tail = (last.tail or '') + (tail or '') or None
+
+    @staticmethod
+    def _matches(element, tag, attrs):
+        # Comments and processing instructions have a non-string tag
+        if not isinstance(element.tag, str) or (tag is not None and element.tag != tag):
+            return False
+        for name, value in (attrs or {}).items():
+            actual = element.get(name)
+            if actual is None:
+                return False
+            if value is True:
+                continue
+            if name == 'class' and value in actual.split():
+                continue
+            if actual != value:
+                return False
+        return True
+
+    def find(self, tag, attrs=None, within=None):
+        root = self.root if within is None else within
+        for element in root.iter(tag):
+            if element is not root and self._matches(element, tag, attrs):
+                return element
+        return None
+
+    def find_all(self, tag, attrs=None, within=None):
+        root = self.root if within is None else within
+        return [element for element in root.iter(tag)
+                if element is not root and self._matches(element, tag, attrs)]
+
+    def find_next_sibling(self, node, tag=None, attrs=None):
+        for element in node.itersiblings():
+            if self._matches(element, tag, attrs):
+                return element
+        return None
+
+    def matches(self, node, tag, attrs=None):
+        return self._matches(node, tag, attrs)
+
+    def tag_name(self, node):
+        return node.tag
+
+    def get_text(self, node):
+        return node.text if len(node) == 0 else None
+
+    def get_attr(self, node, name):
+        return node.get(name)
+
+    def parent(self, node):
+        return node.getparent()
+
+    def descendants(self, node):
+        return [element for element in node.iterdescendants() if isinstance(element.tag, str)]
+
+    def set_text(self, node, text):
+        for child in list(node):
+            node.remove(child)
+        node.text = text
+
+    def set_attr(self, node, name, value):
+        node.set(name, value)
+
+    def new_element(self, tag, attrs=None, text=None):
+        element = self.root.makeelement(tag, attrs or {})
+        if text is not None:
+            element.text = text
+        return element
+
+    def append(self, parent, child):
+        if not isinstance(child, str):
+            parent.append(child)
+        elif len(parent):
+            parent[-1].tail = (parent[-1].tail or '') + child
+        else:
+            parent.text = (parent.text or '') + child
+
+    def insert_after(self, node, new_nodes):
+        parent = node.getparent()
+        position = parent.index(node) + 1
+        parent[position:position] = list(new_nodes)
+
+    def insert_before(self, node, new_nodes):
+        parent = node.getparent()
+        position = parent.index(node)
+        parent[position:position] = list(new_nodes)
+
+    def wrap(self, node, tag):
+        wrapper = self.root.makeelement(tag, {})
+        # The text after the node stays outside the wrapper
+        wrapper.tail, node.tail = node.tail, None
+        node.getparent().replace(node, wrapper)
+        wrapper.append(node)
+        return wrapper
+
+    def remove(self, node):
+        node.drop_tree()
+
+    def clone(self, node):
+        return copy.deepcopy(node)
+
+    def clear(self, node):
+        self.set_text(node, None)
+
+    def copy_document(self):
+        """Return an independent copy of the whole document, without reparsing"""
+        document = object.__new__(LxmlDocument)
+        document._lxml_html = self._lxml_html
+        # Copying the tree rather than the root element keeps the doctype
+        document.root = copy.deepcopy(self.root.getroottree()).getroot()
+        return document
+
+    def serialize(self):
+        doctype = self.root.getroottree().docinfo.doctype
+        output = self._lxml_html.tostring(self.root, doctype=doctype, encoding='unicode')
+        return LXML_VOID_END_PATTERN.sub('', output)
+
+
+# Selectable HTML backends. All produce equivalent documents; 'html.parser'
+# reproduces index.html byte for byte, the lxml ones parse faster.
+HTML_BACKENDS = {
+    'html.parser': lambda html_content: SoupDocument(html_content, 'html.parser'),
+    'lxml': lambda html_content: SoupDocument(html_content, 'lxml'),
+    'lxml.html': LxmlDocument,
+}
+
+
+def load_document(html_content, backend='html.parser'):
+    """Parse HTML with the named backend from HTML_BACKENDS"""
+    return HTML_BACKENDS[backend](html_content)
+
+
+def build_section_index(doc):
+    """Index the page once for the updaters
+
+    Returns a dict with ``ids`` (element by id), ``sidebar`` (sidebar list by
+    its ``h4`` heading) and ``accordion`` (accordion list by its header
+    ``span``). The first section with a given heading wins.
+    """
+    index = {'ids': {}, 'sidebar': {}, 'accordion': {}}
+    for element in doc.find_all(None, {'id': True}):
+        index['ids'].setdefault(doc.get_attr(element, 'id'), element)
+
+    sidebar = index['ids'].get('sidebar')
+    if sidebar is not None:
+        for section in doc.find_all('section', {'class': 'sidebar-section'}, within=sidebar):
+            h4 = doc.find('h4', within=section)
+            ul = doc.find('ul', within=section)
+            if h4 is not None and ul is not None:
+                index['sidebar'].setdefault(doc.get_text(h4), ul)
+
+    accordion = doc.find('div', {'class': 'accordion-container'})
+    if accordion is not None:
+        for item in doc.find_all('div', {'class': 'accordion-item'}, within=accordion):
+            button = doc.find('button', {'class': 'accordion-header'}, within=item)
+            span = doc.find('span', within=button) if button is not None else None
+            panel = doc.find('div', {'class': 'accordion-panel'}, within=item)
+            ul = doc.find('ul', within=panel) if panel is not None else None
+            if span is not None and ul is not None:
+                index['accordion'].setdefault(doc.get_text(span), ul)
+    return index
+
+
+def section_index(doc):
+    """Return the document's section index, building it on first use"""
+    if doc.index is None:
+        doc.index = build_section_index(doc)
+    return doc.index
+
+
+def replace_section_body(doc, anchor, tag, attrs, new_nodes):
+    """Replace the run of ``tag`` elements that follows ``anchor`` with ``new_nodes``
+
+    The old run ends at the first sibling element that does not match. The new
+    nodes are built detached by the caller and attached in one bulk insert,
+    in order, right after ``anchor``.
+    """
+    current = doc.find_next_sibling(anchor)
+    while current is not None and doc.matches(current, tag, attrs):
+        following = doc.find_next_sibling(current)
+        doc.remove(current)
+        current = following
+    if new_nodes:
+        doc.insert_after(anchor, new_nodes)
+
+
+def fill_lists(doc, uls, texts):
+    """Replace the items of every list in ``uls`` with one rendered set of ``<li>``"""
+    items = [doc.new_element('li', text=text) for text in texts]
+    for position, ul in enumerate(uls):
+        doc.clear(ul)
+        for item in items:
+            doc.append(ul, item if position == 0 else doc.clone(item))
+
+
+# =============================================================================
+# HTML Update Functions
+# =============================================================================
+
+def render_item_list(doc, items):
+    """Build the detached ``<ul>`` of bullet items for an entry"""
+    ul = doc.new_element('ul')
+    for item in items:
+        doc.append(ul, doc.new_element('li', text=item))
+    return ul
+
+
+def update_meta_tags(doc, personal_info):
+    """Update meta tags and title with personal information"""
+    # Create full name for use in multiple meta tags
+    name = f"{personal_info.first_name} {personal_info.last_name}"
+
+    # Update title
+    title = doc.find('title')
+    if title is not None:
+        doc.set_text(title, f"{name} - {personal_info.position} CV")
+
+    # Update meta description
+    meta_desc = doc.find('meta', {'name': 'description'})
+    if meta_desc is not None and personal_info.quote:
+        doc.set_attr(meta_desc, 'content', personal_info.quote)
+
+    # Update Open Graph title
+    og_title = doc.find('meta', {'property': 'og:title'})
+    if og_title is not None:
+        doc.set_attr(og_title, 'content', f"{name} - {personal_info.position}")
+
+    # Update Open Graph description
+    og_desc = doc.find('meta', {'property': 'og:description'})
+    if og_desc is not None and personal_info.quote:
+        doc.set_attr(og_desc, 'content', personal_info.quote)
+
+    # Update Twitter title
+    tw_title = doc.find('meta', {'name': 'twitter:title'})
+    if tw_title is not None:
+        doc.set_attr(tw_title, 'content', f"{name} - {personal_info.position}")
+
+    # Update Twitter description
+    tw_desc = doc.find('meta', {'name': 'twitter:description'})
+    if tw_desc is not None and personal_info.quote:
+        doc.set_attr(tw_desc, 'content', personal_info.quote)
+
+
+def update_hero_section(doc, personal_info):
+    """Update hero section with position"""
+    header = doc.find('header', {'class': 'container'})
+    if header is not None:
+        h2 = doc.find('h2', within=header)
+        if h2 is not None:
+            doc.set_text(h2, personal_info.position)
+
+
+def update_about_section(doc, personal_info):
+    """Update about me section with quote"""
+    about_section = doc.find('div', {'class': 'about-me-section'})
+    if about_section is not None and personal_info.quote:
+        hgroup = doc.find('hgroup', within=about_section)
+        if hgroup is not None:
+            p = doc.find('p', within=hgroup)
+            if p is not None:
+                doc.set_text(p, personal_info.quote)
+
+
+def update_experience_section(doc, experiences):
+    """Replace all job experience divs with new content from LaTeX"""
+    # Find the experience section
+    experience_h3 = section_index(doc)['ids'].get('experience')
+    if experience_h3 is None:
+        print("⚠ Warning: Experience section not found")
+        return
+
+    # Build new experiences
+    divs = []
+    for exp, entry_id in iter_entry_ids('experience', experiences):
+        div = doc.new_element('div', {'class': 'job-experience', 'data-id': entry_id})
+
+        # Organization name
+        doc.append(div, doc.new_element('strong', text=f"{exp.org},"))
+        doc.append(div, ' ')
+
+        # Job title
+        doc.append(div, doc.new_element('span', {'class': 'job-title'}, text=exp.title))
+
+        # Dates
+        doc.append(div, doc.new_element('p', text=exp.dates))
+
+        # Items list
+        if exp.items:
+            doc.append(div, render_item_list(doc, exp.items))
+
+        divs.append(div)
+
+    # Replace the existing job-experience divs after the heading
+    replace_section_body(doc, experience_h3, 'div', {'class': 'job-experience'}, divs)
+
+
+def update_education_section(doc, education):
+    """Replace all education experience divs with new content from LaTeX"""
+    # Find the education section
+    education_h3 = section_index(doc)['ids'].get('education')
+    if education_h3 is None:
+        print("⚠ Warning: Education section not found")
+        return
+
+    # Build new education entries
+    divs = []
+    for edu, entry_id in iter_entry_ids('education', education):
+        div = doc.new_element('div', {'class': 'education-experience', 'data-id': entry_id})
+
+        # Degree
+        doc.append(div, doc.new_element('strong', text=edu.title))
+
+        # Institution
+        doc.append(div, doc.new_element('p', text=edu.org))
+
+        # Dates
+        doc.append(div, doc.new_element('p', text=edu.dates))
+
+        # Items list
+        if edu.items:
+            doc.append(div, render_item_list(doc, edu.items))
+
+        divs.append(div)
+
+    # Replace the existing education-experience divs after the heading
+    replace_section_body(doc, education_h3, 'div', {'class': 'education-experience'}, divs)
+
+
+# Category mapping (LaTeX -> HTML)
+SKILL_CATEGORY_MAP = {
+    'Product Management': 'Skills',
+    'Business Analysis': 'Skills',
+    'Modeling': 'Skills',
+    'Technical Skills': 'Technical Skills',
+    'Tools & Platforms': 'Technical Skills',
+    'Domain Knowledge': 'Skills',
+    'Languages': 'Languages',
+}
+
+
+def group_skills(skills):
+    """Group skill lists by their target HTML category, in first-seen order"""
+    grouped = {}
+    for skill in skills:
+        latex_cat = skill.category
+        html_cat = SKILL_CATEGORY_MAP.get(latex_cat, 'Skills')
+
+        if html_cat not in grouped:
+            grouped[html_cat] = []
+        grouped[html_cat].append(skill.skills)
+    return grouped
+
+
+def update_skills_sections(doc, skills):
+    """Update both sidebar and accordion with skills"""
+    grouped = group_skills(skills)
+
+    index = section_index(doc)
+
+    # Sidebar and accordion (mobile view) show the same list
+    for html_cat, skill_list in grouped.items():
+        uls = [index[place][html_cat] for place in ('sidebar', 'accordion')
+               if html_cat in index[place]]
+        fill_lists(doc, uls, skill_list)
+
+
+def _training_text(cert):
+    """Format one certificate as a list entry"""
+    if cert.date:
+        return f"{cert.name} - {cert.date}"
+    return cert.name
+
+
+def update_trainings_section(doc, certificates):
+    """Update trainings/certificates in sidebar and accordion"""
+    index = section_index(doc)
+    uls = [index[place]['Trainings'] for place in ('sidebar', 'accordion')
+           if 'Trainings' in index[place]]
+    fill_lists(doc, uls, [_training_text(cert) for cert in certificates])
+
+
+def update_interests_section(doc, interests):
+    """Update interests section"""
+    interests_h3 = section_index(doc)['ids'].get('interests')
+    if interests_h3 is not None:
+        # Replace the paragraphs after the heading with one per interest
+        paragraphs = [doc.new_element('p', text=interest) for interest in interests]
+        replace_section_body(doc, interests_h3, 'p', None, paragraphs)
+
+
+# =============================================================================
+# Responsive Images
+# =============================================================================
+
+# Directory indexed for the <img> rewrites, relative to the site root
+IMAGE_DIR = 'img'
+
+# Indexed image formats by file extension
+IMAGE_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
+# Formats offered as <picture> sources ahead of the <img>, in order of preference
+PICTURE_TYPES = ['image/webp']
+
+# <img> attributes the rewrite reads
+IMAGE_ATTRS = ('src', 'width', 'height', 'srcset', 'sizes', 'loading', 'fetchpriority')
+
+# JPEG start-of-frame markers, which carry the image size
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# References that are not relative paths: a scheme, //host, /root or #fragment
+EXTERNAL_REF_PATTERN = re.compile(r'^(?:[a-zA-Z][a-zA-Z0-9+.-]*:|//|/|#)')
+
+
+def split_asset_ref(ref):
+    """Split an asset reference into its path and its ?query/#fragment suffix"""
+    match = re.match(r'([^?#]*)(.*)', ref)
+    return match.group(1), match.group(2)
+
+
+def read_image_size(path):
+    """Return ``(width, height)`` from an image file's header, or None if unrecognized
+
+    Only the header is read: for JPEG the segment lengths are followed to
+    the first start-of-frame marker, skipping over EXIF data and never
+    touching the compressed image.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(30)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP' and len(head) == 30:
+            chunk = head[12:16]
+            if chunk == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+                width, height = struct.unpack('<HH', head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L' and head[20] == 0x2F:
+                bits = int.from_bytes(head[21:25], 'little')
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                return (int.from_bytes(head[24:27], 'little') + 1,
+                        int.from_bytes(head[27:30], 'little') + 1)
+            return None
+        if head[:2] != b'\xff\xd8':
+            return None
+        f.seek(2)
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return None
+            if byte != b'\xff':
+                continue
+            marker = f.read(1)
+            while marker == b'\xff':
+                marker = f.read(1)
+            if not marker:
+                return None
+            code = marker[0]
+            # Standalone markers have no length field
+            if code in (0x00, 0x01) or 0xD0 <= code <= 0xD9:
+                continue
+            length = f.read(2)
+            if len(length) < 2:
+                return None
+            if code in JPEG_SOF_MARKERS:
+                frame = f.read(5)
+                if len(frame) < 5:
+                    return None
+                height, width = struct.unpack('>HH', frame[1:5])
+                return width, height
+            f.seek(struct.unpack('>H', length)[0] - 2, os.SEEK_CUR)
+
+
+def index_images(base_path=BASE_PATH, cache=None, image_dir=IMAGE_DIR):
+    """Index the images under ``image_dir`` with their sizes
+
+    ``cache`` is the cache returned by a previous run. A file whose mtime
+    and size are unchanged is not opened; otherwise it is hashed, and its
+    header is read only if no cached file has the same hash. Returns
+    ``(images, cache, read)``: ``{path: {'width', 'height', 'type'}}`` for
+    every recognized image keyed by its path relative to ``base_path``, the
+    new cache and the number of headers read.
+    """
+    base_path = Path(base_path)
+    cache = cache or {}
+    by_hash = {entry['hash']: entry for entry in cache.values()}
+    images = {}
+    new_cache = {}
+    read = 0
+    for path in sorted((base_path / image_dir).rglob('*')):
+        suffix = path.suffix.lower()
+        if suffix not in IMAGE_TYPES or not path.is_file():
+            continue
+        name = path.relative_to(base_path).as_posix()
+        stat = path.stat()
+        entry = cache.get(name)
+        if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            digest = file_hash(path)
+            entry = by_hash.get(digest)
+            if entry is None:
+                size = read_image_size(path)
+                read += 1
+                entry = {'hash': digest, 'width': size and size[0], 'height': size and size[1]}
+            entry = dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        new_cache[name] = entry
+        if entry['width']:
+            images[name] = {'width': entry['width'], 'height': entry['height'],
+                            'type': IMAGE_TYPES[suffix]}
+    return images, new_cache, read
+
+
+def image_family(name, image):
+    """Return the name shared by an image and its resized and converted variants
+
+    ``img/hero-800.jpg`` belongs to ``img/hero`` if it is really 800 pixels
+    wide, so ``-1500-750`` in a photo's name is not mistaken for a size.
+    """
+    stem = posixpath.splitext(name)[0]
+    base, _, width = stem.rpartition('-')
+    return base if base and width == str(image['width']) else stem
+
+
+def image_families(images):
+    """Group the indexed images by family, each sorted by width"""
+    families = {}
+    for name, image in sorted(images.items(), key=lambda item: item[1]['width']):
+        families.setdefault(image_family(name, image), []).append((name, image))
+    return families
+
+
+def responsive_image(attrs, images, families):
+    """Plan the rewrite of one <img>, given its IMAGE_ATTRS in ``attrs``
+
+    Returns None for images that are not in the index, otherwise
+    ``(img_attrs, sources)``: the attributes to change on the <img> and the
+    attributes of one <source> per PICTURE_TYPES format it has variants in.
+    A missing width or height is filled in from the image, keeping its
+    aspect ratio. srcset lists every width of the image's own format;
+    sizes defaults to the displayed width; loading is made lazy unless the
+    page sets it or marks the image high priority.
+    """
+    src = attrs.get('src')
+    if not src or EXTERNAL_REF_PATTERN.match(src):
+        return None
+    path, _ = split_asset_ref(src)
+    name = posixpath.normpath(path)
+    image = images.get(name)
+    if image is None:
+        return None
+
+    new = {}
+    width, height = attrs.get('width'), attrs.get('height')
+    if not width and not height:
+        width, height = str(image['width']), str(image['height'])
+        new.update(width=width, height=height)
+    elif not height and width.isdigit():
+        new['height'] = str(round(int(width) * image['height'] / image['width']))
+    elif not width and height.isdigit():
+        width = new['width'] = str(round(int(height) * image['width'] / image['height']))
+    display = width if width and width.isdigit() else image['width']
+    sizes = attrs.get('sizes') or f"(max-width: {display}px) 100vw, {display}px"
+
+    by_type = {}
+    for variant, info in families[image_family(name, image)]:
+        url = posixpath.join(posixpath.dirname(path), posixpath.basename(variant))
+        by_type.setdefault(info['type'], {}).setdefault(info['width'], url)
+
+    def srcset(widths):
+        return ', '.join(f"{url} {width}w" for width, url in widths.items())
+
+    own = by_type.get(image['type'], {})
+    if len(own) > 1:
+        new.update(srcset=srcset(own), sizes=sizes)
+    if not attrs.get('loading') and attrs.get('fetchpriority') != 'high':
+        new['loading'] = 'lazy'
+    sources = [{'sizes': sizes, 'srcset': srcset(by_type[kind]), 'type': kind}
+               for kind in PICTURE_TYPES if kind in by_type and kind != image['type']]
+    return {key: value for key, value in new.items() if attrs.get(key) != value}, sources
+
+
+def update_images(doc, images):
+    """Rewrite every indexed <img> with its size, srcset, sizes and loading
+
+    An image with variants in PICTURE_TYPES is wrapped in a <picture>, or
+    its existing <picture> gets its <source> elements regenerated.
+    """
+    families = image_families(images)
+    for img in doc.find_all('img', {'src': True}):
+        plan = responsive_image({name: doc.get_attr(img, name) for name in IMAGE_ATTRS},
+                                images, families)
+        if plan is None:
+            continue
+        img_attrs, sources = plan
+        for name, value in img_attrs.items():
+            doc.set_attr(img, name, value)
+        picture = doc.parent(img)
+        if picture is None or doc.tag_name(picture) != 'picture':
+            if not sources:
+                continue
+            picture = doc.wrap(img, 'picture')
+        # New sources take the place of the old ones, or go right before the <img>
+        old_sources = doc.find_all('source', within=picture)
+        doc.insert_before(old_sources[0] if old_sources else img,
+                          [doc.new_element('source', attrs) for attrs in sources])
+        for source in old_sources:
+            doc.remove(source)
+
+
+# =============================================================================
+# Splice Engine
+# =============================================================================
+
+# Tags that never have an end tag
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+             'meta', 'source', 'track', 'wbr'}
+
+# Meta tags rewritten by the meta section: region name -> (attribute, value)
+META_REGIONS = {
+    'meta:description': ('name', 'description'),
+    'meta:og:title': ('property', 'og:title'),
+    'meta:og:description': ('property', 'og:description'),
+    'meta:twitter:title': ('name', 'twitter:title'),
+    'meta:twitter:description': ('name', 'twitter:description'),
+}
+
+# Headings followed by a run of generated sibling elements: id -> (tag, class)
+ENTRY_RUNS = {
+    'experience': ('div', 'job-experience'),
+    'education': ('div', 'education-experience'),
+    'interests': ('p', None),
+}
+
+
+class RegionLocator(HTMLParser):
+    """Find the character offsets of every region the sync rewrites
+
+    Streams the page through the standard library tokenizer and records
+    ``(start, end)`` spans without building a tree:
+
+    - ``title``, ``hero`` and ``about``: the inner HTML of the element
+    - ``meta:*``: the whole ``<meta>`` tag (see META_REGIONS)
+    - ``experience``, ``education``, ``interests``: the run of generated
+      siblings right after the heading with that id
+    - ``sidebar:<h4>`` and ``accordion:<span>``: the inner HTML of the list
+    - ``image:<n>``: the n-th ``<img>`` tag, or the whole ``<picture>`` around it
+    """
+
+    def __init__(self, html_content):
+        super().__init__(convert_charrefs=True)
+        self.html = html_content
+        self.line_starts = [0]
+        for match in re.finditer('\n', html_content):
+            self.line_starts.append(match.end())
+        self.regions = {}
+        self.stack = []
+        self.run = None
+        self.images = 0
+
+    def char_offset(self):
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def inside(self, tag, cls=None, id=None):
+        """Return the innermost open element matching tag, class and id"""
+        for entry in reversed(self.stack):
+            if entry['tag'] != tag:
+                continue
+            if cls is not None and cls not in entry['attrs'].get('class', '').split():
+                continue
+            if id is not None and entry['attrs'].get('id') != id:
+                continue
+            return entry
+        return None
+
+    def end_run(self):
+        self.run = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        start = self.char_offset()
+        end = start + len(self.get_starttag_text())
+
+        if self.run and len(self.stack) == self.run['depth']:
+            run_tag, run_class = ENTRY_RUNS[self.run['name']]
+            if tag != run_tag or (run_class and run_class not in attrs.get('class', '').split()):
+                self.end_run()
+
+        if tag == 'meta':
+            for name, (attr, value) in META_REGIONS.items():
+                if attrs.get(attr) == value and name not in self.regions:
+                    self.regions[name] = (start, end)
+
+        if tag == 'img':
+            region = f"image:{self.images}"
+            self.images += 1
+            picture = self.inside('picture')
+            if picture is not None:
+                picture.setdefault('image', region)
+            else:
+                self.regions[region] = (start, end)
+
+        if tag not in VOID_TAGS:
+            self.stack.append({'tag': tag, 'attrs': attrs, 'start': start, 'inner': end})
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if not any(entry['tag'] == tag for entry in self.stack):
+            return
+        start = self.char_offset()
+        end = self.html.index('>', start) + 1
+        while self.stack:
+            entry = self.stack.pop()
+            if entry['tag'] == tag:
+                break
+        if self.run and len(self.stack) < self.run['depth']:
+            self.end_run()
+        self.close_element(entry, entry['inner'], start, end)
+
+    def close_element(self, entry, inner_start, inner_end, end):
+        tag = entry['tag']
+        attrs = entry['attrs']
+        span = (inner_start, inner_end)
+
+        if tag == 'title':
+            self.regions.setdefault('title', span)
+        elif tag == 'h2' and self.inside('header', cls='container'):
+            self.regions.setdefault('hero', span)
+        elif tag == 'p' and self.inside('hgroup') and self.inside('div', cls='about-me-section'):
+            self.regions.setdefault('about', span)
+        elif tag == 'h4':
+            section = self.inside('section', cls='sidebar-section')
+            if section is not None and self.inside('aside', id='sidebar'):
+                section['label'] = entry.get('text', '')
+        elif tag == 'span' and self.inside('button', cls='accordion-header'):
+            item = self.inside('div', cls='accordion-item')
+            if item is not None and self.inside('div', cls='accordion-container'):
+                item['label'] = entry.get('text', '')
+        elif tag == 'ul':
+            section = self.inside('section', cls='sidebar-section')
+            item = self.inside('div', cls='accordion-item')
+            if section is not None and 'label' in section and self.inside('aside', id='sidebar'):
+                self.regions.setdefault(f"sidebar:{section['label']}", span)
+            elif item is not None and 'label' in item and self.inside('div', cls='accordion-panel'):
+                self.regions.setdefault(f"accordion:{item['label']}", span)
+
+        if tag == 'picture' and 'image' in entry:
+            self.regions[entry['image']] = (entry['start'], end)
+
+        if tag == 'h3' and attrs.get('id') in ENTRY_RUNS and attrs['id'] not in self.regions:
+            # The generated entries start right after the heading
+            self.regions[attrs['id']] = (end, end)
+            self.run = {'name': attrs['id'], 'depth': len(self.stack)}
+        elif self.run and len(self.stack) == self.run['depth']:
+            self.regions[self.run['name']] = (self.regions[self.run['name']][0], end)
+
+    def handle_data(self, data):
+        if self.stack:
+            self.stack[-1]['text'] = self.stack[-1].get('text', '') + data
+        if self.run and len(self.stack) == self.run['depth'] and data.strip():
+            self.end_run()
+
+    def handle_comment(self, data):
+        if self.run and len(self.stack) == self.run['depth']:
+            self.end_run()
+
+
+def locate_regions(html_content):
+    """Return ``{region: (start, end)}`` character offsets for index.html"""
+    locator = RegionLocator(html_content)
+    locator.feed(html_content)
+    locator.close()
+    return locator.regions
+
+
+class MarkupTokens(HTMLParser):
+    """Tokenize an HTML fragment into a form that ignores serializer differences
+
+    Attribute order and quoting, self-closing slashes, end tags of void
+    elements, character references and whitespace runs do not change the
+    tokens, so the output of every HTML backend compares equal.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tokens = []
+
+    def handle_starttag(self, tag, attrs):
+        self.tokens.append(('start', tag, sorted((name, value or '') for name, value in attrs)))
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_TAGS:
+            self.tokens.append(('end', tag))
+
+    def handle_data(self, data):
+        text = ' '.join(data.split())
+        if text:
+            self.tokens.append(('text', text))
+
+    def handle_comment(self, data):
+        self.tokens.append(('comment', data))
+
+
+def markup_tokens(fragment):
+    """Return the serializer-independent tokens of an HTML fragment"""
+    parser = MarkupTokens()
+    parser.feed(fragment)
+    parser.close()
+    return parser.tokens
+
+
+def escape_text(text):
+    """Escape text content the way the bs4 serializer does"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def quote_attr(value):
+    """Escape and quote an attribute value the way the bs4 serializer does"""
+    value = escape_text(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', '&quot;') + '"'
+
+
+def set_tag_attr(tag_html, name, value):
+    """Return a start tag with one attribute set, keeping the rest of its text"""
+    pattern = re.compile(r'(\s' + re.escape(name) + r'\s*=\s*)("[^"]*"|\'[^\']*\'|[^\s>]+)')
+    if pattern.search(tag_html):
+        return pattern.sub(lambda m: m.group(1) + quote_attr(value), tag_html, count=1)
+    closing = '/>' if tag_html.endswith('/>') else '>'
+    return f"{tag_html[:-len(closing)].rstrip()} {name}={quote_attr(value)}{closing}"
+
+
+TAG_ATTR_PATTERN = re.compile(r"""([^\s=/>]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?""")
+
+
+def get_tag_attrs(tag_html):
+    """Return every attribute of a start tag, unescaped, in document order"""
+    attrs = {}
+    for name, value in TAG_ATTR_PATTERN.findall(tag_html, re.match(r'<[^\s/>]*', tag_html).end()):
+        if value[:1] in ('"', "'"):
+            value = value[1:-1]
+        attrs.setdefault(name.lower(), html.unescape(value))
+    return attrs
+
+
+def render_void_tag(tag, attrs):
+    """Render a void element the way the bs4 serializer does, attributes sorted"""
+    rendered = ''.join(f' {name}={quote_attr(value)}' for name, value in sorted(attrs.items()))
+    return f"<{tag}{rendered}/>"
+
+
+def render_list(texts):
+    """Render ``<li>`` items for a sidebar or accordion list"""
+    return ''.join(f"<li>{escape_text(text)}</li>" for text in texts)
+
+
+def render_items(items):
+    """Render the bullet list of an entry, if it has any items"""
+    return f"<ul>{render_list(items)}</ul>" if items else ''
+
+
+def splice_meta_tags(personal_info):
+    """Region replacements for update_meta_tags"""
+    name = f"{personal_info.first_name} {personal_info.last_name}"
+    title = f"{name} - {personal_info.position}"
+    quote = personal_info.quote
+    replacements = {
+        'title': escape_text(f"{title} CV"),
+        'meta:og:title': lambda tag: set_tag_attr(tag, 'content', title),
+        'meta:twitter:title': lambda tag: set_tag_attr(tag, 'content', title),
+    }
+    if quote:
+        for region in ['meta:description', 'meta:og:description', 'meta:twitter:description']:
+            replacements[region] = lambda tag: set_tag_attr(tag, 'content', quote)
+    return replacements
+
+
+def splice_hero_section(personal_info):
+    """Region replacements for update_hero_section"""
+    return {'hero': escape_text(personal_info.position)}
+
+
+def splice_about_section(personal_info):
+    """Region replacements for update_about_section"""
+    if not personal_info.quote:
+        return {}
+    return {'about': escape_text(personal_info.quote)}
+
+
+def render_job(exp, entry_id):
+    """Render one job-experience div, as update_experience_section builds it"""
+    return (f'<div class="job-experience" data-id="{entry_id}">'
+            f'<strong>{escape_text(exp.org)},</strong> '
+            f'<span class="job-title">{escape_text(exp.title)}</span>'
+            f'<p>{escape_text(exp.dates)}</p>{render_items(exp.items)}</div>')
+
+
+def render_degree(edu, entry_id):
+    """Render one education-experience div, as update_education_section builds it"""
+    return (f'<div class="education-experience" data-id="{entry_id}">'
+            f'<strong>{escape_text(edu.title)}</strong>'
+            f'<p>{escape_text(edu.org)}</p><p>{escape_text(edu.dates)}</p>'
+            f'{render_items(edu.items)}</div>')
+
+
+def splice_experience_section(experiences):
+    """Region replacements for update_experience_section"""
+    return {'experience': ''.join(render_job(exp, entry_id)
+                                  for exp, entry_id in iter_entry_ids('experience', experiences))}
+
+
+def splice_education_section(education):
+    """Region replacements for update_education_section"""
+    return {'education': ''.join(render_degree(edu, entry_id)
+                                 for edu, entry_id in iter_entry_ids('education', education))}
+
+
+def splice_skills_sections(skills):
+    """Region replacements for update_skills_sections"""
+    replacements = {}
+    for html_cat, skill_list in group_skills(skills).items():
+        fragment = render_list(skill_list)
+        replacements[f"sidebar:{html_cat}"] = fragment
+        replacements[f"accordion:{html_cat}"] = fragment
+    return replacements
+
+
+def splice_trainings_section(certificates):
+    """Region replacements for update_trainings_section"""
+    fragment = render_list(_training_text(cert) for cert in certificates)
+    return {'sidebar:Trainings': fragment, 'accordion:Trainings': fragment}
+
+
+def splice_interests_section(interests):
+    """Region replacements for update_interests_section"""
+    return {'interests': ''.join(f"<p>{escape_text(interest)}</p>" for interest in interests)}
+
+
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+SOURCE_TAG_PATTERN = re.compile(r'<source\b[^>]*>', re.IGNORECASE)
+
+
+def render_image(fragment, images, families):
+    """Rewrite an ``image:<n>`` region as update_images does"""
+    attrs = get_tag_attrs(IMG_TAG_PATTERN.search(fragment).group(0))
+    plan = responsive_image(attrs, images, families)
+    if plan is None:
+        return fragment
+    img_attrs, sources = plan
+    tag = render_void_tag('img', {**attrs, **img_attrs})
+    rendered = ''.join(render_void_tag('source', attrs) for attrs in sources)
+    if not fragment.startswith('<picture'):
+        return f"<picture>{rendered}{tag}</picture>" if sources else tag
+    fragment = IMG_TAG_PATTERN.sub(lambda match: tag, fragment, count=1)
+    match = SOURCE_TAG_PATTERN.search(fragment) or IMG_TAG_PATTERN.search(fragment)
+    rest = SOURCE_TAG_PATTERN.sub('', fragment[match.start():])
+    return fragment[:match.start()] + rendered + rest
+
+
+def splice_images(images):
+    """Region replacements for update_images"""
+    families = image_families(images)
+    return {'image:*': lambda fragment: render_image(fragment, images, families)}
+
+
+# Splice renderer for each section in SECTIONS, and for the images section
+SPLICE_RENDERERS = {
+    'meta': splice_meta_tags,
+    'hero': splice_hero_section,
+    'about': splice_about_section,
+    'experience': splice_experience_section,
+    'education': splice_education_section,
+    'skills': splice_skills_sections,
+    'trainings': splice_trainings_section,
+    'interests': splice_interests_section,
+    'images': splice_images,
+}
+
+
+def splice_sections(html_content, regions, dirty):
+    """Render the dirty sections as region replacements
+
+    Returns ``{region: new_html}`` for every region whose content changes.
+    A renderer key ending in ``*`` applies to every region with that prefix.
+    Regions missing from the page are skipped, with a warning for the
+    experience and education blocks like the DOM updaters give. Entry
+    sections of a streamed source are returned as a lazy iterator of
+    chunks instead, rendered one entry at a time as the page is written.
+    """
+    replacements = {}
+    for section, _, data in dirty:
+        if section in ('experience', 'education') and section not in regions:
+            print(f"⚠ Warning: {section.capitalize()} section not found")
+        if isinstance(data, LatexStream) and section in STREAM_RENDERERS and section in regions:
+            entries = iter_entry_ids(section, data)
+            replacements[section] = itertools.starmap(STREAM_RENDERERS[section], entries)
+            continue
+        for key, fragment in SPLICE_RENDERERS[section](data).items():
+            if key.endswith('*'):
+                names = [region for region in regions if region.startswith(key[:-1])]
+            else:
+                names = [key] if key in regions else []
+            for region in names:
+                start, end = regions[region]
+                old = html_content[start:end]
+                new = fragment(old) if callable(fragment) else fragment
+                if new != old:
+                    replacements[region] = new
+    return replacements
+
+
+def iter_spliced(html_content, regions, replacements):
+    """Yield the page in chunks with the replaced regions spliced in
+
+    A replacement is a string, or an iterable of chunks that is consumed
+    only when its region is reached.
+    """
+    position = 0
+    for region in sorted(replacements, key=lambda name: regions[name][0]):
+        start, end = regions[region]
+        yield html_content[position:start]
+        if isinstance(replacements[region], str):
+            yield replacements[region]
+        else:
+            yield from replacements[region]
+        position = end
+    yield html_content[position:]
+
+
+def shift_regions(regions, replacements):
+    """Return the region offsets after ``replacements`` are spliced in
+
+    Returns None if a replacement was streamed, since its length is unknown.
+    """
+    if not all(isinstance(new, str) for new in replacements.values()):
+        return None
+    shifted = {}
+    delta = 0
+    for region, (start, end) in sorted(regions.items(), key=lambda item: item[1][0]):
+        new_start = start + delta
+        if region in replacements:
+            delta += len(replacements[region]) - (end - start)
+        shifted[region] = (new_start, end + delta)
+    return shifted
+
+
+# Entry sections the streaming renderer writes one entry at a time
+STREAM_RENDERERS = {
+    'experience': render_job,
+    'education': render_degree,
+}
+
+
+# =============================================================================
+# Backups
+# =============================================================================
+
+BACKUP_DIR = STATE_PATH / 'backups'
+BACKUP_KEEP = 20
+
+
+def load_backup_index(store_path):
+    """Load the backup index, or an empty one if the store does not exist yet"""
+    try:
+        return json.loads((store_path / 'index.json').read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {'snapshots': []}
+
+
+def create_backup(html_path, store_path=BACKUP_DIR, keep=BACKUP_KEEP):
+    """Snapshot index.html into the compressed, deduplicated backup store
+
+    Snapshots are stored once per content hash as gzip files under
+    ``objects/``. ``index.json`` lists them oldest first, so the latest is
+    its last entry. Only the newest ``keep`` snapshots are retained; objects
+    no longer referenced are deleted.
+    """
+    data = Path(html_path).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    index = load_backup_index(store_path)
+    snapshots = index['snapshots']
+
+    if snapshots and snapshots[-1]['hash'] == digest:
+        print(f"✓ Backup unchanged: {snapshots[-1]['id']}")
+        return snapshots[-1]
+
+    objects_path = store_path / 'objects'
+    objects_path.mkdir(parents=True, exist_ok=True)
+    object_path = objects_path / f"{digest}.html.gz"
+    if not object_path.exists():
+        tmp_path = object_path.with_suffix('.tmp')
+        tmp_path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        os.replace(tmp_path, object_path)
+
+    snapshot_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+    taken = {snapshot['id'] for snapshot in snapshots}
+    suffix = 1
+    while snapshot_id in taken:
+        suffix += 1
+        snapshot_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{suffix}"
+
+    snapshot = {'id': snapshot_id, 'hash': digest, 'size': len(data)}
+    snapshots.append(snapshot)
+
+    # Retention: keep the newest snapshots and drop unreferenced objects
+    evicted = snapshots[:-keep] if keep > 0 else []
+    index['snapshots'] = snapshots[len(evicted):]
+    kept_hashes = {entry['hash'] for entry in index['snapshots']}
+    for entry in evicted:
+        if entry['hash'] not in kept_hashes:
+            (objects_path / f"{entry['hash']}.html.gz").unlink(missing_ok=True)
+
+    write_text_atomic(store_path / 'index.json', json.dumps(index, indent=2) + '\n')
+    print(f"✓ Backup created: {snapshot_id}")
+    return snapshot
+
+
+def find_backup(store_path, snapshot_id=None):
+    """Return the latest snapshot entry, or the one whose id or hash prefix matches"""
+    snapshots = load_backup_index(store_path)['snapshots']
+    if snapshot_id is None:
+        return snapshots[-1] if snapshots else None
+    for snapshot in reversed(snapshots):
+        if snapshot['id'] == snapshot_id or snapshot['hash'].startswith(snapshot_id):
+            return snapshot
+    return None
+
+
+def read_backup(store_path, snapshot):
+    """Return the decompressed content of a snapshot"""
+    return gzip.decompress((store_path / 'objects' / f"{snapshot['hash']}.html.gz").read_bytes())
+
+
+def find_latest_backup(base_path):
+    """Find the most recent legacy index-*.html.backup file in the base directory"""
+    backup_files = sorted(base_path.glob('index-*.html.backup'))
+    return backup_files[-1] if backup_files else None
+
+
+def list_backups(store_path=BACKUP_DIR):
+    """Print the snapshots in the backup store, newest first"""
+    snapshots = load_backup_index(store_path)['snapshots']
+    if not snapshots:
+        print("No backups in the store")
+        return
+    for snapshot in reversed(snapshots):
+        print(f"{snapshot['id']}  {snapshot['hash'][:12]}  {snapshot['size']:>8} bytes")
+
+
+def revert_to_backup(base_path, snapshot_id=None, store_path=BACKUP_DIR):
+    """Restore index.html from the latest backup, or from ``snapshot_id``"""
+    print("=" * 60)
+    source = f"Backup {snapshot_id}" if snapshot_id else "Latest Backup"
+    print(f"CV Revert: Restoring from {source}")
+    print("=" * 60)
+
+    html_path = base_path / 'index.html'
+    snapshot = find_backup(store_path, snapshot_id)
+
+    if snapshot:
+        print(f"\n✓ Found backup: {snapshot['id']}")
+        data = read_backup(store_path, snapshot)
+        name = snapshot['id']
+    else:
+        # Fall back to backups made before the store existed
+        backup_file = find_latest_backup(base_path) if snapshot_id is None else None
+        if not backup_file:
+            print(f"✗ No backup found{f' for {snapshot_id}' if snapshot_id else ''}")
+            sys.exit(1)
+        print(f"\n✓ Found legacy backup: {backup_file.name}")
+        data = backup_file.read_bytes()
+        name = backup_file.name
+
+    # Restore from backup
+    write_text_atomic(html_path, data.decode('utf-8'))
+    print(f"✓ Restored index.html from {name}")
+    print("\n" + "=" * 60)
+    print("✓ Revert complete!")
+    print("=" * 60)
+
+
+# =============================================================================
+# Sync Manifest
+# =============================================================================
+
+MANIFEST_VERSION = 5
+
+# HTML sections in update order: (name, LaTeX source, parsed field, updater).
+# Sources are relative to the LaTeX root and must be reachable from cv.tex.
+SECTIONS = [
+    ('meta', 'cv.tex', 'personal', update_meta_tags),
+    ('hero', 'cv.tex', 'personal', update_hero_section),
+    ('about', 'cv.tex', 'personal', update_about_section),
+    ('experience', 'cv/experience.tex', 'cventry', update_experience_section),
+    ('education', 'cv/education.tex', 'cventry', update_education_section),
+    ('skills', 'cv/skills.tex', 'cvskill', update_skills_sections),
+    ('trainings', 'cv/certificates.tex', 'cvhonor', update_trainings_section),
+    ('interests', 'cv/extracurricular.tex', 'item', update_interests_section),
+]
+
+
+def content_hash(data):
+    """Return the SHA-256 hex digest of bytes, str or JSON-serializable data"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    elif not isinstance(data, bytes):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False,
+                          default=model_json).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(manifest_path):
+    """Load the sync manifest, or return an empty one if missing or unreadable"""
+    try:
+        manifest = json.loads(Path(manifest_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    for entry in manifest.get('sources', {}).values():
+        entry['parsed'] = ParsedSource.from_dict(entry['parsed'])
+    return manifest
+
+
+def save_manifest(manifest_path, manifest):
+    """Write the sync manifest if it changed; return whether it was written"""
+    manifest['version'] = MANIFEST_VERSION
+    text = json.dumps(manifest, indent=2, sort_keys=True, default=model_json) + '\n'
+    if text_unchanged(manifest_path, text):
+        return False
+    write_text_atomic(manifest_path, text)
+    return True
+
+
+# =============================================================================
+# LaTeX Source Resolution
+# =============================================================================
+
+INPUT_PATTERN = re.compile(r'\\(?:input|include)\{([^}]+)\}')
+COMMENT_PATTERN = re.compile(r'(?<!\\)%.*')
+
+
+def find_inputs(content):
+    """Return the files pulled in by \\input/\\include, in document order"""
+    names = INPUT_PATTERN.findall(COMMENT_PATTERN.sub('', content))
+    return [name if name.endswith('.tex') else f"{name}.tex" for name in names]
+
+
+def parse_latex_source(content, root=False):
+    """Parse one LaTeX file into every structure the sync knows about"""
+    nodes = scan_latex(content)
+    return ParsedSource(
+        inputs=find_inputs(content),
+        cventry=parse_cventry(nodes),
+        cvskill=parse_cvskill(nodes),
+        cvhonor=parse_cvhonor(nodes),
+        item=parse_interests(nodes),
+        personal=parse_personal_info(content) if root else None,
+    )
+
+
+# Files at least this large are hashed from a memory map and streamed
+STREAM_THRESHOLD = 4 * 1024 * 1024
+INPUT_MACROS = {'input': 1, 'include': 1}
+
+
+def parse_latex_file(path, digest):
+    """Scan a large LaTeX file for its inputs only, streaming it from a memory map
+
+    The entry fields are LatexStreams that parse the file again when they
+    are rendered. ``digest`` is the file's hash.
+    """
+    inputs = [node.args[0] if node.args[0].endswith('.tex') else f"{node.args[0]}.tex"
+              for node in scan_latex_file(path, INPUT_MACROS)]
+    streams = {name: LatexStream(str(path), name, digest) for name in LATEX_BUILDERS}
+    return ParsedSource(inputs=inputs, **streams)
+
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file, hashed from a memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return content_hash(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def load_latex_source(path, cached=None, root=False, stream_threshold=STREAM_THRESHOLD):
+    """Load and parse a LaTeX file, reusing ``cached`` when the file is unchanged
+
+    Returns ``(entry, changed)``. The file is not read at all when its mtime
+    and size match the cached entry; a touched but identical file is detected
+    by its hash and not reparsed. Files of ``stream_threshold`` bytes or
+    more, other than the root, are never read into a str: they are hashed
+    from a memory map and their entries streamed by parse_latex_file().
+    """
+    stat = path.stat()
+    if cached and cached['parsed'].streamed_from() not in (None, str(path)):
+        # The tree was moved since; its streams must read this file
+        cached = None
+    if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+        return cached, False
+
+    stream = not root and stat.st_size >= stream_threshold
+    if stream:
+        digest = file_hash(path)
+    else:
+        content = read_latex_file(path)
+        digest = content_hash(content)
+    if cached and cached['hash'] == digest:
+        return dict(cached, mtime_ns=stat.st_mtime_ns, size=stat.st_size), False
+
+    parsed = parse_latex_file(path, digest) if stream else parse_latex_source(content, root=root)
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'hash': digest,
+        'parsed': parsed,
+    }, True
+
+
+def source_unchanged(path, cached):
+    """Return whether a cached source entry still matches the file's mtime and size"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    return (bool(cached) and cached['mtime_ns'] == stat.st_mtime_ns
+            and cached['size'] == stat.st_size
+            and cached['parsed'].streamed_from() in (None, str(path)))
+
+
+def resolve_latex_sources(latex_path, root='cv.tex', cache=None, max_workers=8,
+                          stream_threshold=STREAM_THRESHOLD):
+    """Follow the \\input graph from ``root`` and load every file in it
+
+    The files of each level of the include graph that have to be read are
+    loaded concurrently on a thread pool, which is only started when the
+    first such file turns up. ``cache`` maps relative paths to entries from a
+    previous run. Files of ``stream_threshold`` bytes or more are streamed.
+    Returns ``(sources, changed)``: the loaded entries keyed by path relative
+    to ``latex_path`` in discovery order, and the paths that were reparsed.
+    """
+    cache = cache or {}
+    sources = {}
+    changed = []
+    level = [root]
+    pool = None
+
+    try:
+        while level:
+            futures = {}
+            for name in level:
+                if source_unchanged(latex_path / name, cache.get(name)):
+                    futures[name] = None
+                    continue
+                if pool is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    pool = ThreadPoolExecutor(max_workers=max_workers)
+                futures[name] = pool.submit(load_latex_source, latex_path / name,
+                                            cache.get(name), name == root, stream_threshold)
+            level = []
+            for name, future in futures.items():
+                try:
+                    entry, is_changed = (cache[name], False) if future is None else future.result()
+                except OSError as e:
+                    print(f"⚠ Warning: Cannot read {name}: {e}")
+                    continue
+                sources[name] = entry
+                if is_changed:
+                    changed.append(name)
+                for child in entry['parsed'].inputs:
+                    if child not in sources and child not in futures and child not in level:
+                        level.append(child)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return sources, changed
+
+
+def cv_from_sources(sources):
+    """Assemble the CV model from parsed sources, following SECTIONS"""
+    data = {section: getattr(sources[source]['parsed'], name)
+            for section, source, name, _ in SECTIONS if source in sources}
+    return CV(
+        personal=data.get('meta') or PersonalInfo(),
+        experience=data.get('experience', []),
+        education=data.get('education', []),
+        skills=data.get('skills', []),
+        trainings=data.get('trainings', []),
+        interests=data.get('interests', []),
+    )
+
+
+def load_cv(latex_path=LATEX_PATH, state_path=STATE_PATH):
+    """Return the CV model, reparsing only the LaTeX files that changed
+
+    The parsed sources are cached in the manifest by content hash, so any
+    output can load the model without running the parser on unchanged files.
+    """
+    manifest_path = Path(state_path) / 'manifest.json'
+    manifest = load_manifest(manifest_path)
+    sources, changed = resolve_latex_sources(Path(latex_path), cache=manifest.get('sources'))
+    if changed or manifest.get('sources') != sources:
+        manifest['sources'] = sources
+        save_manifest(manifest_path, manifest)
+    return cv_from_sources(sources)
+
+
+# =============================================================================
+# Rendering
+# =============================================================================
+
+def plan_sections(sources, old_sections):
+    """Fingerprint every section's data and find the ones that need rendering
+
+    Returns ``(section_hashes, dirty)`` where ``dirty`` lists
+    ``(section, updater, data)`` for sections whose fingerprint differs from
+    ``old_sections``.
+    """
+    section_hashes = {}
+    dirty = []
+    for section, source, name, updater in SECTIONS:
+        if source not in sources:
+            print(f"⚠ Warning: {source} is not included from cv.tex - {section} section skipped")
+            continue
+        data = getattr(sources[source]['parsed'], name)
+        section_hashes[section] = content_hash(data)
+        if section_hashes[section] != old_sections.get(section):
+            dirty.append((section, updater, data))
+    return section_hashes, dirty
+
+
+@functools.cache
+def default_file_mode():
+    """Return the mode open() gives a new file: 0o666 less the process umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_chunks_atomic(path, chunks):
+    """Stream text chunks to a temporary sibling, then move it over ``path``
+
+    Readers never see a partial file. Returns the SHA-256 of the written text.
+    """
+    path = Path(path)
+    digest = hashlib.sha256()
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk.encode('utf-8'))
+        # mkstemp creates the file as 0600; keep the target's mode, or use the default
+        mode = path.stat().st_mode & 0o777 if path.exists() else default_file_mode()
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return digest.hexdigest()
+
+
+def write_text_atomic(path, text):
+    """Write a text file via a temporary sibling so readers never see a partial file"""
+    return write_chunks_atomic(path, [text])
+
+
+def text_unchanged(path, text):
+    """Return whether the file at ``path`` already holds ``text``"""
+    try:
+        return Path(path).read_text(encoding='utf-8') == text
+    except OSError:
+        return False
+
+
+def write_bytes_atomic(path, data, mode=0o644):
+    """Write a binary file via a temporary sibling so readers never see a partial file"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def render_cv(latex_path, html_content, backend='html.parser', root='cv.tex', base_path=None):
+    """Render every section of a LaTeX tree into an HTML template, without a manifest
+
+    The sources are found from the \\input graph of ``root``. With
+    ``base_path``, the <img> tags are also rewritten from the images under
+    it, as sync() does for the page's directory.
+    """
+    sources, _ = resolve_latex_sources(Path(latex_path), root=root)
+    if root not in sources:
+        raise FileNotFoundError(f"No {root} in {latex_path}")
+    _, dirty = plan_sections(sources, {})
+    if base_path is not None:
+        dirty.append(('images', update_images, index_images(base_path)[0]))
+    doc = load_document(html_content, backend)
+    for _, updater, data in dirty:
+        updater(doc, data)
+    return doc.serialize()
+
+
+def render_cv_stream(latex_path, html_content, output_path, root='cv.tex', base_path=None):
+    """Render a LaTeX tree into a template with the splice engine, streaming entries
+
+    Renders what render_cv() does, from the same \\input graph, but every
+    source other than ``root`` is streamed from a memory map: the entry
+    sections are written to ``output_path`` one entry at a time, so memory
+    is bounded by the largest entry rather than by the sources. Returns the
+    SHA-256 of the output.
+    """
+    sources, _ = resolve_latex_sources(Path(latex_path), root=root, stream_threshold=0)
+    if root not in sources:
+        raise FileNotFoundError(f"No {root} in {latex_path}")
+    _, dirty = plan_sections(sources, {})
+    if base_path is not None:
+        dirty.append(('images', update_images, index_images(base_path)[0]))
+    regions = locate_regions(html_content)
+    replacements = splice_sections(html_content, regions, dirty)
+    return write_chunks_atomic(output_path, iter_spliced(html_content, regions, replacements))
+
+
+# =============================================================================
+# Batch Mode
+# =============================================================================
+
+# Per-process state of a batch worker, set up once by _init_batch_worker
+_worker_backend = 'html.parser'
+_worker_engine = 'dom'
+_worker_templates = {}
+
+
+def _init_batch_worker(backend, engine='dom'):
+    """Import and warm up the HTML backend once per worker process"""
+    global _worker_backend, _worker_engine
+    _worker_backend = backend
+    _worker_engine = engine
+    if engine == 'dom':
+        load_document('<!DOCTYPE html><html><head></head><body></body></html>', backend)
+
+
+def run_batch_job(job):
+    """Render one batch job; failures are returned, never raised"""
+    started = time.perf_counter()
+    try:
+        template_path = Path(job['template'])
+        if template_path not in _worker_templates:
+            _worker_templates[template_path] = template_path.read_text(encoding='utf-8')
+        output_path = Path(job['output'])
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # The page's images are looked up next to it, as sync() does for index.html
+        if _worker_engine == 'splice':
+            render_cv_stream(job['latex_root'], _worker_templates[template_path],
+                             output_path, job.get('root', 'cv.tex'), output_path.parent)
+        else:
+            output = render_cv(job['latex_root'], _worker_templates[template_path],
+                               _worker_backend, job.get('root', 'cv.tex'), output_path.parent)
+            write_text_atomic(output_path, output)
+    except Exception as e:
+        return {'job': job, 'ok': False, 'error': f"{type(e).__name__}: {e}",
+                'seconds': time.perf_counter() - started}
+    return {'job': job, 'ok': True, 'seconds': time.perf_counter() - started}
+
+
+def load_batch_manifest(manifest_path):
+    """Read batch jobs, resolving their paths against the manifest's directory
+
+    The manifest is JSON: ``{"jobs": [{"latex_root": ..., "template": ...,
+    "output": ..., "root": "cv.tex"}]}``; ``root`` is optional.
+    """
+    manifest_path = Path(manifest_path)
+    jobs = json.loads(manifest_path.read_text(encoding='utf-8'))['jobs']
+    base = manifest_path.parent
+    return [
+        dict(job, **{key: str(base / job[key]) for key in ('latex_root', 'template', 'output')})
+        for job in jobs
+    ]
+
+
+def batch(manifest_path, workers=None, backend='html.parser', engine='dom'):
+    """Render many CVs from a batch manifest on a process pool
+
+    Each job renders every section of its LaTeX tree into its template and
+    writes the output path. With the splice ``engine`` jobs are rendered by
+    render_cv_stream(), in bounded memory. A failing job is reported and
+    does not stop the others. Exits non-zero if any job failed.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    print("=" * 60)
+    print("CV Batch: LaTeX → HTML")
+    print("=" * 60)
+
+    jobs = load_batch_manifest(manifest_path)
+    workers = workers or os.cpu_count() or 1
+    renderer = backend if engine == 'dom' else 'streaming splice'
+    print(f"\n{len(jobs)} jobs on {workers} worker processes ({renderer})\n")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(backend, engine)) as pool:
+        results = list(pool.map(run_batch_job, jobs))
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        job = result['job']
+        if result['ok']:
+            print(f"  ✓ {job['latex_root']} → {job['output']} "
+                  f"({result['seconds'] * 1000:.0f} ms)")
+        else:
+            print(f"  ✗ {job['latex_root']} → {job['output']}: {result['error']}")
+
+    failed = [result for result in results if not result['ok']]
+    print("\n" + "=" * 60)
+    print(f"{'✗' if failed else '✓'} {len(results) - len(failed)} of {len(results)} jobs "
+          f"succeeded in {elapsed:.2f} s")
+    print("=" * 60)
+    if failed:
+        sys.exit(1)
+
+
+# =============================================================================
+# Variants
+# =============================================================================
+
+# List sections a variant can hide or limit. Those not introduced by a heading
+# (see ENTRY_RUNS) are found by their sidebar and accordion labels.
+VARIANT_SECTIONS = {
+    'experience': None,
+    'education': None,
+    'skills': sorted(set(SKILL_CATEGORY_MAP.values())),
+    # The accordion item is labelled "Trainings & Certifications"
+    'trainings': ['Trainings', 'Trainings & Certifications'],
+    'interests': None,
+}
+
+# Containers removed with a hidden sidebar or accordion list: place -> (tag, class)
+VARIANT_CONTAINERS = {
+    'sidebar': ('section', 'sidebar-section'),
+    'accordion': ('div', 'accordion-item'),
+}
+
+
+def load_variant_manifest(manifest_path):
+    """Read a variant manifest, resolving its paths against the manifest's directory
+
+    The manifest is JSON: ``{"latex_root": ..., "template": ..., "variants":
+    [{"name": ..., "output": ..., "template": ..., "hide": [...], "limit": ...}]}``.
+    ``latex_root`` defaults to the repo's CV and a variant's ``template`` to
+    the manifest's; ``hide`` and ``limit`` are optional.
+    """
+    manifest_path = Path(manifest_path)
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    base = manifest_path.parent
+    latex_root = base / manifest['latex_root'] if 'latex_root' in manifest else LATEX_PATH
+    variants = []
+    for variant in manifest['variants']:
+        template = variant.get('template', manifest.get('template'))
+        if template is None:
+            raise ValueError(f"variant {variant['name']!r} has no template")
+        variants.append(dict(variant, template=base / template, output=base / variant['output']))
+    return latex_root, variants
+
+
+def plan_variant(plan, variant):
+    """Apply a variant's ``hide`` and ``limit`` to the full render plan
+
+    ``limit`` is a number of entries for the experience and education
+    sections, or ``{section: n}`` for any section in VARIANT_SECTIONS.
+    Returns ``(updates, hidden)``: the ``(section, updater, data)`` to render
+    and the sections to remove from the page.
+    """
+    limit = variant.get('limit') or {}
+    if isinstance(limit, int):
+        limit = dict.fromkeys(ENTRY_ID_PREFIXES, limit)
+    hide = set(variant.get('hide', []))
+    for section in sorted((hide | set(limit)) - set(VARIANT_SECTIONS)):
+        print(f"⚠ Warning: variant {variant['name']!r} cannot hide or limit {section} - ignored")
+    updates = [(section, updater,
+                list(itertools.islice(data, limit[section])) if section in limit else data)
+               for section, updater, data in plan if section not in hide]
+    return updates, sorted(hide & set(VARIANT_SECTIONS))
+
+
+def hide_section(doc, section):
+    """Remove a section from the page: its heading and entries, or its lists' containers
+
+    Navigation links to the section's heading are removed with it, together
+    with their list items.
+    """
+    index = section_index(doc)
+    for nav in doc.find_all('nav'):
+        for link in doc.find_all('a', {'href': f"#{section}"}, within=nav):
+            item = doc.parent(link)
+            doc.remove(item if item is not None and doc.tag_name(item) == 'li' else link)
+    labels = VARIANT_SECTIONS[section]
+    if labels is None:
+        heading = index['ids'].get(section)
+        if heading is not None:
+            tag, cls = ENTRY_RUNS[section]
+            replace_section_body(doc, heading, tag, {'class': cls} if cls else None, [])
+            doc.remove(heading)
+        return
+    for place, (tag, cls) in VARIANT_CONTAINERS.items():
+        for label in labels:
+            node = index[place].get(label)
+            while node is not None and not doc.matches(node, tag, {'class': cls}):
+                node = doc.parent(node)
+            if node is not None:
+                doc.remove(node)
+
+
+def render_variants(manifest_path, backend='html.parser'):
+    """Render every variant of a manifest from one parse of the sources and templates
+
+    The LaTeX tree is parsed once and every template once, into a pristine
+    document that is never modified. Each variant renders into a copy of
+    its template's document, with its sections hidden and its entries
+    limited, and is written only when its output changed. Prints the time
+    of every variant.
+    """
+    print("=" * 60)
+    print("CV Variants: LaTeX → HTML")
+    print("=" * 60)
+
+    latex_root, variants = load_variant_manifest(manifest_path)
+    started = time.perf_counter()
+    sources, _ = resolve_latex_sources(Path(latex_root))
+    if 'cv.tex' not in sources:
+        print(f"✗ No cv.tex in {latex_root}")
+        sys.exit(1)
+    _, plan = plan_sections(sources, {})
+    parse_seconds = time.perf_counter() - started
+    print(f"\n✓ {len(sources)} LaTeX files parsed once ({parse_seconds * 1000:.0f} ms)")
+
+    templates = {}
+    for template in dict.fromkeys(variant['template'] for variant in variants):
+        if not template.is_file():
+            print(f"✗ Template {template} not found")
+            sys.exit(1)
+        started = time.perf_counter()
+        templates[template] = load_document(template.read_text(encoding='utf-8'), backend)
+        print(f"✓ {template.name} parsed once ({backend}, "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    print(f"\n  {'variant':<20} {'copy':>8} {'render':>8} {'write':>8}")
+    started = time.perf_counter()
+    for variant in variants:
+        timings = {}
+        mark = time.perf_counter()
+        doc = templates[variant['template']].copy_document()
+        timings['copy'] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        updates, hidden = plan_variant(plan, variant)
+        for _, updater, data in updates:
+            updater(doc, data)
+        for section in hidden:
+            hide_section(doc, section)
+        output = doc.serialize()
+        timings['render'] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        output_path = variant['output']
+        written = not text_unchanged(output_path, output)
+        if written:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            write_text_atomic(output_path, output)
+        timings['write'] = time.perf_counter() - mark
+
+        note = output_path.name if written else f"{output_path.name} unchanged"
+        print(f"  {variant['name']:<20} " + ' '.join(f"{timings[name] * 1000:>6.1f}ms"
+                                                    for name in ('copy', 'render', 'write'))
+              + f"  → {note}")
+    elapsed = time.perf_counter() - started
+
+    print("\n" + "=" * 60)
+    print(f"✓ {len(variants)} variants rendered in {elapsed:.2f} s")
+    print("=" * 60)
+
+
+# =============================================================================
+# Instrumentation
+# =============================================================================
+
+class StageMetrics:
+    """Wall time and peak traced memory of each sync stage
+
+    Stages are recorded flat, in the order they run; a disabled instance
+    measures nothing, so sync() can always wrap its stages.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = []
+        self.started = None
+
+    def start(self):
+        if self.enabled:
+            import tracemalloc
+            tracemalloc.start()
+            self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        import tracemalloc
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages.append({'stage': name, 'seconds': elapsed,
+                                'peak_bytes': tracemalloc.get_traced_memory()[1]})
+
+    def stop(self, **info):
+        """Stop tracing and return the JSON report, with ``info`` added"""
+        import tracemalloc
+        total = time.perf_counter() - self.started
+        tracemalloc.stop()
+        return {**info, 'total_seconds': total,
+                'peak_bytes': max((s['peak_bytes'] for s in self.stages), default=0),
+                'stages': self.stages}
+
+
+def print_metrics(report):
+    """Print a stage table for a StageMetrics report"""
+    print(f"\n{'Stage':<32} {'ms':>9} {'peak KiB':>10}")
+    for stage in report['stages']:
+        print(f"{stage['stage']:<32} {stage['seconds'] * 1000:>9.2f} "
+              f"{stage['peak_bytes'] / 1024:>10.1f}")
+    print(f"{'total':<32} {report['total_seconds'] * 1000:>9.2f} "
+          f"{report['peak_bytes'] / 1024:>10.1f}")
+
+
+# =============================================================================
+# Sync
+# =============================================================================
+
+def publish(manifest, base_path, backend, precompress, release, metrics, deploy=None):
+    """Run the optional steps after a sync: the release build, precompression, the deploy"""
+    if not (release or precompress or deploy):
+        return
+    from sync_publish import RELEASE_PRECOMPRESS, run_deploy, run_precompress, run_release
+
+    if release:
+        with metrics.stage('build_release'):
+            run_release(release, backend, base_path)
+    if precompress:
+        with metrics.stage('precompress'):
+            if release:
+                run_precompress(manifest, release, RELEASE_PRECOMPRESS, 'precompressed_release')
+            else:
+                run_precompress(manifest, base_path)
+    if deploy:
+        with metrics.stage('deploy'):
+            key = 'precompressed_release' if release else 'precompressed'
+            run_deploy(release or base_path, deploy, release=bool(release),
+                       compressed=manifest.get(key))
+
+
+def sync(force=False, backend='html.parser', engine='dom', keep_backups=BACKUP_KEEP,
+         latex_path=LATEX_PATH, html_path=HTML_PATH, state_path=STATE_PATH, metrics=None,
+         precompress=False, release=None, deploy=None):
+    """Main synchronization function
+
+    The LaTeX files are discovered from the \\input graph of cv.tex. Parsed
+    files are cached in .sync/manifest.json by mtime and size, only sections
+    whose data changed are re-rendered, and index.html is left untouched when
+    the output would be identical. ``force`` ignores the manifest.
+
+    ``engine`` is 'dom' to parse index.html with the ``backend`` from
+    HTML_BACKENDS, or 'splice' to rewrite only the located regions of the
+    page as text, keeping everything else byte for byte. Before index.html
+    is rewritten it is snapshotted into the backup store, which retains the
+    newest ``keep_backups`` snapshots.
+
+    The paths default to the repo's CV; ``state_path`` holds the manifest
+    and the backup store. A started StageMetrics passed as ``metrics``
+    records the time and peak memory of every stage and update call.
+    ``release`` is a directory to build a fingerprinted, minified copy of
+    the site into after the sync. ``precompress`` refreshes the .gz/.br
+    siblings of the text assets, in the release if one is built, otherwise
+    next to ``html_path``. ``deploy`` is a web root to publish the site, or
+    the release, to last. The search index of the entries is rewritten next
+    to ``html_path`` whenever it changes.
+    """
+    metrics = metrics or StageMetrics(enabled=False)
+    print("=" * 60)
+    print("CV Synchronization: LaTeX → HTML")
+    print("=" * 60)
+
+    latex_path = Path(latex_path)
+    html_path = Path(html_path)
+    manifest_path = Path(state_path) / 'manifest.json'
+    store_path = Path(state_path) / 'backups'
+
+    with metrics.stage('load_manifest'):
+        manifest = {} if force else load_manifest(manifest_path)
+    with metrics.stage('read_html'):
+        html_content = html_path.read_text(encoding='utf-8')
+    # A hand-edited index.html invalidates every recorded section
+    html_fresh = manifest.get('output') == content_hash(html_content)
+    old_sections = manifest.get('sections', {}) if html_fresh else {}
+    old_regions = manifest.get('regions', {})
+
+    # 1. Read LaTeX files
+    print("\n[1/5] Reading LaTeX files...")
+    with metrics.stage('resolve_latex_sources'):
+        sources, changed = resolve_latex_sources(latex_path, cache=manifest.get('sources'))
+    print(f"✓ LaTeX files read successfully ({len(changed)} of {len(sources)} changed)")
+
+    # 2. Collect parsed content
+    print("\n[2/5] Parsing LaTeX content...")
+    if 'cv.tex' in sources:
+        personal_info = sources['cv.tex']['parsed'].personal
+        print(f"  - Personal info: {personal_info.first_name} {personal_info.last_name}")
+    mapped = {source for _, source, _, _ in SECTIONS}
+    for name, entry in sources.items():
+        parsed = entry['parsed']
+        status = 'reparsed' if name in changed else 'cached'
+        note = '' if name in mapped else ', no HTML section'
+        if name == 'cv.tex':
+            continue
+        if parsed.streamed_from():
+            print(f"  - {name}: {entry['size'] / 2**20:.1f} MB, streamed ({status}{note})")
+        else:
+            count = len(parsed.cventry) + len(parsed.cvskill) + len(parsed.cvhonor)
+            print(f"  - {name}: {count} entries, {len(parsed.item)} items ({status}{note})")
+
+    with metrics.stage('plan_sections'):
+        section_hashes, dirty = plan_sections(sources, old_sections)
+    with metrics.stage('index_images'):
+        images, image_cache, read = index_images(html_path.parent, manifest.get('images'))
+    print(f"  - {IMAGE_DIR}/: {len(images)} images indexed ({read} headers read)")
+    # The images are one more section, rendered after the LaTeX ones
+    section_hashes['images'] = content_hash(images)
+    if section_hashes['images'] != old_sections.get('images'):
+        dirty.append(('images', update_images, images))
+    # The index is rebuilt only when its sections change, so a streamed
+    # source is not parsed again on every run
+    search_key = content_hash([SEARCH_INDEX_VERSION,
+                               *(section_hashes.get(section) for section in SEARCH_SECTIONS)])
+    index_path = html_path.parent / SEARCH_INDEX
+    written = False
+    if manifest.get('search_index') != search_key or not index_path.exists():
+        with metrics.stage('search_index'):
+            written = update_search_index(cv_from_sources(sources), index_path)
+    print(f"  - {SEARCH_INDEX}: {'written' if written else 'unchanged'}")
+    manifest = {'sources': sources, 'sections': section_hashes, 'images': image_cache,
+                'search_index': search_key,
+                'output': content_hash(html_content), 'regions': old_regions,
+                'precompressed': {} if force else manifest.get('precompressed', {}),
+                'precompressed_release': {} if force else manifest.get('precompressed_release', {})}
+
+    if not dirty:
+        publish(manifest, html_path.parent, backend, precompress, release, metrics, deploy)
+        with metrics.stage('save_manifest'):
+            save_manifest(manifest_path, manifest)
+        print("\n" + "=" * 60)
+        print("✓ index.html is up to date - nothing to do")
+        print("=" * 60)
+        return
+
+    if engine == 'splice':
+        # 3. Locate the regions to rewrite
+        print("\n[3/5] Locating HTML regions...")
+        if old_regions.get('html') == manifest['output']:
+            regions = {name: tuple(span) for name, span in old_regions['offsets'].items()}
+            print(f"✓ {len(regions)} region offsets reused from manifest")
+        else:
+            with metrics.stage('locate_regions'):
+                regions = locate_regions(html_content)
+            print(f"✓ {len(regions)} regions located")
+
+        # 4. Render changed regions
+        print("\n[4/5] Rendering HTML regions...")
+        replacements = {}
+        for section, updater, data in dirty:
+            with metrics.stage(SPLICE_RENDERERS[section].__name__):
+                replacements.update(splice_sections(html_content, regions,
+                                                    [(section, updater, data)]))
+            print(f"  ✓ {section.capitalize()} section rendered")
+
+        # 5. Stream the page with the new regions spliced in
+        print("\n[5/5] Writing HTML...")
+        if not replacements:
+            print("✓ Output unchanged - index.html not rewritten")
+        else:
+            with metrics.stage('create_backup'):
+                create_backup(html_path, store_path, keep=keep_backups)
+            with metrics.stage('write_html'):
+                manifest['output'] = write_chunks_atomic(
+                    html_path, iter_spliced(html_content, regions, replacements))
+            regions = shift_regions(regions, replacements)
+            print(f"✓ index.html written ({len(replacements)} regions spliced)")
+        # Offsets after a streamed region are unknown; the next run locates them
+        manifest['regions'] = {'html': manifest['output'], 'offsets': regions} if regions else {}
+    else:
+        # 3. Load and parse HTML
+        print("\n[3/5] Loading HTML...")
+        with metrics.stage('load_document'):
+            doc = load_document(html_content, backend)
+        print(f"✓ HTML loaded successfully ({backend})")
+
+        # 4. Update changed HTML sections
+        print("\n[4/5] Updating HTML sections...")
+        for section, updater, data in dirty:
+            with metrics.stage(updater.__name__):
+                updater(doc, data)
+            print(f"  ✓ {section.capitalize()} section updated")
+
+        # 5. Write updated HTML
+        print("\n[5/5] Writing HTML...")
+        with metrics.stage('serialize'):
+            output = doc.serialize()
+        if output == html_content:
+            print("✓ Output unchanged - index.html not rewritten")
+        else:
+            with metrics.stage('create_backup'):
+                create_backup(html_path, store_path, keep=keep_backups)
+            with metrics.stage('write_html'):
+                write_text_atomic(html_path, output)
+            print("✓ index.html written")
+        manifest['output'] = content_hash(output)
+    publish(manifest, html_path.parent, backend, precompress, release, metrics, deploy)
+    with metrics.stage('save_manifest'):
+        save_manifest(manifest_path, manifest)
+
+    print("\n" + "=" * 60)
+    print("✓ Synchronization complete!")
+    print("=" * 60)
+
+
+def check(latex_path=LATEX_PATH, html_path=HTML_PATH, state_path=STATE_PATH):
+    """Report the sections of index.html that are out of date, without writing anything
+
+    The section fingerprints are compared with the manifest first; if they
+    all match a manifest written for this very page, the check is done
+    without looking at the HTML. Otherwise the regions are located as by the
+    splice engine, and the fragments of every candidate section are rendered
+    and compared with the page's markup, whichever backend serialized it.
+    Neither the manifest nor index.html is written and no backup is made.
+    search-index.json is compared with the index the sync would write.
+    Returns the stale section names.
+    """
+    latex_path = Path(latex_path)
+    html_path = Path(html_path)
+    manifest = load_manifest(Path(state_path) / 'manifest.json')
+    html_content = html_path.read_text(encoding='utf-8')
+    html_hash = content_hash(html_content)
+    html_fresh = manifest.get('output') == html_hash
+    old_sections = manifest.get('sections', {}) if html_fresh else {}
+
+    sources, _ = resolve_latex_sources(latex_path, cache=manifest.get('sources'))
+    _, candidates = plan_sections(sources, old_sections)
+    images, _, _ = index_images(html_path.parent, manifest.get('images'))
+    if content_hash(images) != old_sections.get('images'):
+        candidates.append(('images', update_images, images))
+
+    stale = []
+    if candidates:
+        old_regions = manifest.get('regions', {})
+        if old_regions.get('html') == html_hash:
+            regions = {name: tuple(span) for name, span in old_regions['offsets'].items()}
+        else:
+            regions = locate_regions(html_content)
+        for candidate in candidates:
+            # Any backend may have written the page, so its serialization is ignored
+            replacements = splice_sections(html_content, regions, [candidate])
+            if any(markup_tokens(new) != markup_tokens(html_content[slice(*regions[region])])
+                   for region, new in replacements.items()):
+                stale.append(candidate[0])
+
+    search_path = html_path.parent / SEARCH_INDEX
+    if not text_unchanged(search_path, render_search_index(cv_from_sources(sources))):
+        stale.append(SEARCH_INDEX)
+
+    for section, _, _ in candidates:
+        print(f"  {'✗' if section in stale else '✓'} {section}")
+    print(f"  {'✗' if SEARCH_INDEX in stale else '✓'} {SEARCH_INDEX}")
+    if stale:
+        print(f"✗ Out of date: {', '.join(stale)} "
+              f"(run: python .sync/sync_cv.py)")
+    else:
+        print(f"✓ {html_path.name} and {SEARCH_INDEX} are up to date "
+              f"({len(candidates)} sections rendered to compare)")
+    return stale
+
+
+def watch(interval=0.1, backend='html.parser', keep_backups=BACKUP_KEEP):
+    """Keep the parsed CV and HTML tree in memory and re-render on every save
+
+    The include graph of cv.tex and index.html are polled every ``interval``
+    seconds. A changed LaTeX file is reparsed and only the sections whose data
+    changed are re-rendered into the resident tree, which is then written
+    atomically, together with the search index. Polls that find no change
+    do no other work. index.html is re-read only if someone else modifies
+    it. The manifest keeps the caches of the other commands, such as the
+    image index and the precompressed hashes.
+    """
+    latex_path = LATEX_PATH
+    html_path = HTML_PATH
+    manifest_path = STATE_PATH / 'manifest.json'
+
+    print("=" * 60)
+    print(f"CV Watch: LaTeX → HTML (polling every {interval * 1000:.0f} ms, Ctrl+C to stop)")
+    print("=" * 60)
+
+    manifest = load_manifest(manifest_path)
+    sources, _ = resolve_latex_sources(latex_path, cache=manifest.get('sources'))
+    doc = None
+    html_stat = None
+    section_hashes = {}
+    backed_up = False
+    indexed = False
+
+    def stamp(path):
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def stamps():
+        result = {}
+        for name in sources:
+            try:
+                result[name] = stamp(latex_path / name)
+            except OSError:
+                result[name] = None
+        return result
+
+    seen = stamps()
+    try:
+        while True:
+            started = time.perf_counter()
+            reloaded = False
+
+            if doc is None or stamp(html_path) != html_stat:
+                # First pass, or index.html was edited outside the watcher
+                html_content = html_path.read_text(encoding='utf-8')
+                doc = load_document(html_content, backend)
+                html_stat = stamp(html_path)
+                fresh = manifest.get('output') == content_hash(html_content)
+                section_hashes = manifest.get('sections', {}) if fresh else {}
+                print(f"\n✓ Loaded {html_path.name}")
+                reloaded = True
+
+            current = stamps()
+            changed = []
+            if current != seen:
+                sources, changed = resolve_latex_sources(latex_path, cache=sources)
+                current = stamps()
+            seen = current
+
+            # Planning hashes the whole CV, so an idle poll skips it
+            dirty = []
+            if changed or reloaded:
+                new_hashes, dirty = plan_sections(sources, section_hashes)
+            if dirty:
+                for section, updater, data in dirty:
+                    updater(doc, data)
+                output = doc.serialize()
+                if output != html_content:
+                    if not backed_up:
+                        create_backup(html_path, keep=keep_backups)
+                        backed_up = True
+                    write_text_atomic(html_path, output)
+                    html_content = output
+                    html_stat = stamp(html_path)
+                elapsed = (time.perf_counter() - started) * 1000
+                names = ', '.join(section for section, _, _ in dirty)
+                changed_names = ', '.join(changed) or 'index.html'
+                print(f"✓ {changed_names} → {names} ({elapsed:.0f} ms)")
+
+            if dirty or changed or not indexed:
+                if update_search_index(cv_from_sources(sources), html_path.parent / SEARCH_INDEX):
+                    print(f"✓ {SEARCH_INDEX} written")
+                indexed = True
+
+            if dirty or changed:
+                # The image hash and the other commands' caches stay valid
+                section_hashes = {**section_hashes, **new_hashes}
+                manifest = {**manifest, 'sources': sources, 'sections': section_hashes,
+                            'output': content_hash(html_content)}
+                save_manifest(manifest_path, manifest)
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n✓ Watch stopped")
@@ -0,0 +1,139 @@
+"""
+CV PDF Builds
+Cached, parallel TeX builds of the Awesome CV documents
+"""
+
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sync_core import BASE_PATH, STATE_PATH, content_hash, file_hash, find_inputs, read_latex_file
+
+
+# =============================================================================
+# PDF Builds
+# =============================================================================
+
+TEX_ROOT = BASE_PATH / '.awesome-CV'
+BUILD_STATE_PATH = STATE_PATH / 'builds.json'
+# TeX engine command; a stub can stand in for it via --tex-engine or CV_TEX_ENGINE
+TEX_ENGINE = os.environ.get('CV_TEX_ENGINE', 'xelatex')
+
+# PDF documents, relative to TEX_ROOT; the engine runs there as the Makefile does
+PDF_DOCUMENTS = {
+    'cv': 'myCV/cv.tex',
+    'example-cv': 'examples/cv.tex',
+    'example-resume': 'examples/resume.tex',
+    'example-coverletter': 'examples/coverletter.tex',
+}
+
+
+def latex_input_files(tex_path):
+    """Return a document and every file reachable from it through \\input"""
+    files = [tex_path]
+    for path in files:
+        try:
+            content = read_latex_file(path)
+        except OSError:
+            continue
+        for name in find_inputs(content):
+            child = tex_path.parent / name
+            if child not in files:
+                files.append(child)
+    return files
+
+
+def document_hash(tex_root, tex_path, engine):
+    """Hash a document's \\input graph, the awesome-cv.cls it may load and the engine"""
+    candidates = latex_input_files(tex_path)
+    candidates += [tex_path.parent / 'awesome-cv.cls', tex_root / 'awesome-cv.cls']
+    fingerprint = {'engine': engine}
+    for path in candidates:
+        if path.is_file():
+            fingerprint[path.relative_to(tex_root).as_posix()] = file_hash(path)
+    return content_hash(fingerprint)
+
+
+def build_document(tex_root, tex_path, engine):
+    """Run the TeX engine on one document; returns ``(ok, log tail)``"""
+    command = shlex.split(engine) + [
+        '-interaction=nonstopmode', '-halt-on-error',
+        f"-output-directory={tex_path.parent.relative_to(tex_root).as_posix()}",
+        tex_path.relative_to(tex_root).as_posix(),
+    ]
+    try:
+        result = subprocess.run(command, cwd=tex_root, capture_output=True, text=True,
+                                errors='replace')
+    except OSError as e:
+        return False, str(e)
+    pdf_path = tex_path.with_suffix('.pdf')
+    if result.returncode != 0 or not pdf_path.is_file():
+        return False, '\n'.join((result.stdout + result.stderr).splitlines()[-15:])
+    return True, ''
+
+
+def build_pdfs(names=None, engine=TEX_ENGINE, workers=None, force=False,
+               tex_root=TEX_ROOT, state_path=BUILD_STATE_PATH):
+    """Build the PDF documents whose inputs changed, in parallel
+
+    Each document is fingerprinted from its \\input graph, the class file
+    and the engine command, and is rebuilt only when the fingerprint
+    differs from the last successful build or its PDF is missing. Exits
+    non-zero if any build failed.
+    """
+    print("=" * 60)
+    print(f"CV Build: LaTeX → PDF ({engine})")
+    print("=" * 60)
+
+    tex_root = Path(tex_root)
+    state_path = Path(state_path)
+    names = names or list(PDF_DOCUMENTS)
+    unknown = [name for name in names if name not in PDF_DOCUMENTS]
+    if unknown:
+        print(f"✗ Unknown document(s): {', '.join(unknown)} "
+              f"(choose from {', '.join(PDF_DOCUMENTS)})")
+        sys.exit(2)
+    try:
+        state = json.loads(state_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        state = {}
+
+    pending = {}
+    for name in names:
+        tex_path = tex_root / PDF_DOCUMENTS[name]
+        digest = document_hash(tex_root, tex_path, engine)
+        if not force and state.get(name) == digest and tex_path.with_suffix('.pdf').is_file():
+            print(f"  - {name}: up to date")
+        else:
+            pending[name] = (tex_path, digest)
+
+    failed = []
+    if pending:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            futures = {name: pool.submit(build_document, tex_root, tex_path, engine)
+                       for name, (tex_path, _) in pending.items()}
+            for name, future in futures.items():
+                ok, log = future.result()
+                if ok:
+                    state[name] = pending[name][1]
+                    pdf_path = pending[name][0].with_suffix('.pdf')
+                    print(f"  ✓ {name}: {pdf_path.relative_to(tex_root)}")
+                else:
+                    state.pop(name, None)
+                    failed.append(name)
+                    print(f"  ✗ {name}: build failed\n{log}")
+        print(f"\n{len(pending)} document(s) built in {time.perf_counter() - started:.2f} s")
+        state_path.write_text(json.dumps(state, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+    print("\n" + "=" * 60)
+    mark = '✗' if failed else '✓'
+    print(f"{mark} {len(names) - len(failed)} of {len(names)} documents ready")
+    print("=" * 60)
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,588 @@
+"""
+CV Publishing
+Precompressed siblings, the fingerprinted and minified release, and the deploy
+"""
+
+import gzip
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from sync_core import (BASE_PATH, EXTERNAL_REF_PATTERN, RELEASE_PATH, SEARCH_INDEX, content_hash,
+                       file_hash, load_document, split_asset_ref, write_bytes_atomic,
+                       write_text_atomic)
+
+
+# =============================================================================
+# Precompression
+# =============================================================================
+
+# Text assets served by nginx, relative to the repo root
+PRECOMPRESS_ASSETS = ['index.html', 'error404.html', 'custom.css', 'js/*.js', 'icons/*.svg',
+                      SEARCH_INDEX]
+
+
+def _import_brotli():
+    """Return the optional brotli module, or None when it is not installed"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def precompress_assets(base_path=BASE_PATH, cache=None, patterns=PRECOMPRESS_ASSETS):
+    """Write maximum-level .gz (and .br, if brotli is installed) siblings of the text assets
+
+    ``cache`` maps asset paths to the source hash their siblings were made
+    from; an asset is recompressed only when its hash changed or a sibling
+    is missing. gzip output has a zero mtime, so it is reproducible.
+    Returns ``(cache, written)`` with the updated cache and the recompressed
+    asset paths.
+    """
+    base_path = Path(base_path)
+    cache = cache or {}
+    brotli = _import_brotli()
+    suffixes = ['.gz', '.br'] if brotli else ['.gz']
+    new_cache = {}
+    written = []
+    for pattern in patterns:
+        for path in sorted(base_path.glob(pattern)):
+            name = path.relative_to(base_path).as_posix()
+            data = path.read_bytes()
+            digest = content_hash(data)
+            new_cache[name] = digest
+            siblings = [path.with_name(path.name + suffix) for suffix in suffixes]
+            if cache.get(name) == digest and all(sibling.exists() for sibling in siblings):
+                continue
+            # Siblings get the asset's permissions, so nginx can read them too
+            mode = path.stat().st_mode & 0o777
+            write_bytes_atomic(siblings[0], gzip.compress(data, compresslevel=9, mtime=0), mode)
+            if brotli:
+                write_bytes_atomic(siblings[1], brotli.compress(data, quality=11), mode)
+            written.append(name)
+    return new_cache, written
+
+
+def run_precompress(manifest, base_path=BASE_PATH, patterns=PRECOMPRESS_ASSETS,
+                    key='precompressed'):
+    """Refresh the compressed siblings and record their hashes in ``manifest[key]``"""
+    print(f"\nPrecompressing assets in {base_path}...")
+    manifest[key], written = precompress_assets(base_path, manifest.get(key), patterns)
+    formats = 'gzip + brotli' if _import_brotli() else 'gzip'
+    print(f"✓ {len(written)} of {len(manifest[key])} assets compressed ({formats})")
+
+
+# =============================================================================
+# Release Build
+# =============================================================================
+
+# Pages copied into the release, relative to the repo root
+RELEASE_PAGES = ['index.html', 'error404.html']
+# (tag, attribute) pairs that reference local assets to fingerprint; every URL of a
+# srcset is fingerprinted
+ASSET_REFERENCES = [('link', 'href'), ('script', 'src'), ('img', 'src'), ('img', 'srcset'),
+                    ('source', 'srcset')]
+# Files the scripts fetch at runtime, copied under their plain names
+RELEASE_DATA = [SEARCH_INDEX]
+RELEASE_MANIFEST = '.release.json'
+# Text assets of a release, compressed by --precompress
+RELEASE_PRECOMPRESS = ['*.html', '*.css', 'js/*.js', 'icons/*.svg', SEARCH_INDEX]
+
+CSS_URL_PATTERN = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+
+# Content whose whitespace is significant, kept verbatim by minify_html
+RAW_TEXT_PATTERN = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)',
+                              re.IGNORECASE | re.DOTALL)
+HTML_COMMENT_PATTERN = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+BLOCK_TAG_PATTERN = re.compile(
+    r'\s*(<(?:!DOCTYPE|/?(?:html|head|body|meta|link|title|base|script|style|noscript|div|p|'
+    r'ul|ol|li|dl|dt|dd|h[1-6]|header|footer|main|nav|section|article|aside|hgroup|'
+    r'details|summary|table|thead|tbody|tr|td|th|form|fieldset|hr|br|figure))\b[^>]*>)\s*',
+    re.IGNORECASE)
+
+
+def local_asset(base_dir, ref):
+    """Return the file a relative reference points at, or None for external or missing ones"""
+    if not ref or EXTERNAL_REF_PATTERN.match(ref):
+        return None
+    path, _ = split_asset_ref(ref)
+    target = (Path(base_dir) / path).resolve()
+    return target if target.is_file() else None
+
+
+def fingerprint_asset(base_path, release_path, path, assets):
+    """Copy ``path`` into the release under a content-hashed name
+
+    Returns the new path relative to the release root. ``assets`` maps the
+    assets already copied to their names. Each asset is also copied under its
+    plain name. url() references inside CSS are fingerprinted first, so a
+    changed image also changes the stylesheet's name.
+    """
+    if path in assets:
+        return assets[path]
+    rel = path.relative_to(base_path)
+    data = path.read_bytes()
+    if path.suffix == '.css':
+        def rewrite(match):
+            target = local_asset(path.parent, match.group(2))
+            if target is None:
+                return match.group(0)
+            name = fingerprint_asset(base_path, release_path, target, assets)
+            new_ref = posixpath.relpath(name, posixpath.dirname(rel.as_posix()) or '.')
+            quote = match.group(1)
+            return f"url({quote}{new_ref}{split_asset_ref(match.group(2))[1]}{quote})"
+        data = CSS_URL_PATTERN.sub(rewrite, data.decode('utf-8')).encode('utf-8')
+
+    name = rel.with_name(f"{rel.stem}.{content_hash(data)[:10]}{rel.suffix}").as_posix()
+    output = Path(release_path) / name
+    if not output.exists():
+        output.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes_atomic(output, data)
+    # A copy under the plain name keeps absolute links such as og:image working
+    write_bytes_atomic(Path(release_path) / rel, data)
+    assets[path] = name
+    return name
+
+
+def minify_html(html_content):
+    """Strip comments and collapse whitespace, leaving pre/textarea/script/style intact
+
+    Whitespace is removed entirely only around block-level tags, where it
+    never renders, so the spacing between inline elements is preserved.
+    """
+    parts = RAW_TEXT_PATTERN.split(html_content)
+    output = []
+    # split() yields text, then (raw block, its tag name) pairs
+    for index in range(0, len(parts), 3):
+        text = HTML_COMMENT_PATTERN.sub('', parts[index])
+        text = BLOCK_TAG_PATTERN.sub(r'\1', re.sub(r'[ \t\n\r\f]+', ' ', text))
+        if index and parts[index - 1].lower() != 'textarea':
+            text = text.lstrip()
+        if index + 2 < len(parts) and parts[index + 2].lower() != 'textarea':
+            text = text.rstrip()
+        output.append(text)
+        if index + 1 < len(parts):
+            output.append(parts[index + 1])
+    return ''.join(output).strip()
+
+
+# Stylesheets whose above-the-fold rules are inlined into each page
+CRITICAL_STYLESHEETS = ['custom.css']
+# Elements rendered above the fold: the skip link, hero, header, about, sidebar
+CRITICAL_ROOTS = [
+    ('a', {'class': 'skip-link'}),
+    ('div', {'class': 'hero'}),
+    ('header', {'class': 'container'}),
+    ('div', {'class': 'about-me-section'}),
+    ('aside', {'id': 'sidebar'}),
+]
+# ...plus the first experience entries
+CRITICAL_ENTRIES = 2
+
+CSS_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_TOKEN_PATTERN = re.compile(r'''"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|[{};]''')
+SELECTOR_NOISE_PATTERN = re.compile(r'\[[^\]]*\]|::?[\w-]+(?:\([^)]*\))?')
+SELECTOR_PART_PATTERN = re.compile(r'([#.]?)(-?[_a-zA-Z][\w-]*)')
+
+
+def parse_css_rules(css):
+    """Split a stylesheet into top-level ``(prelude, block)`` rules
+
+    ``block`` is the text between the braces, or None for statements such
+    as @import. Blocks of @media and @supports hold nested rules that can be
+    parsed again.
+    """
+    css = CSS_COMMENT_PATTERN.sub('', css)
+    rules = []
+    start = 0
+    depth = 0
+    for match in CSS_TOKEN_PATTERN.finditer(css):
+        token = match.group()
+        if token == '{':
+            if depth == 0:
+                prelude, block_start = css[start:match.start()].strip(), match.end()
+            depth += 1
+        elif token == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[block_start:match.start()].strip()))
+                start = match.end()
+        elif token == ';' and depth == 0:
+            rules.append((css[start:match.start()].strip(), None))
+            start = match.end()
+    return rules
+
+
+def selector_used(selectors, parts):
+    """True if any selector in a selector list can match the elements in ``parts``
+
+    ``parts`` holds the tag names, ``.classes`` and ``#ids`` of the elements.
+    Attribute selectors and pseudo-classes are ignored, so the test errs on
+    the side of keeping a rule.
+    """
+    for selector in selectors.split(','):
+        needed = {prefix + name for prefix, name in
+                  SELECTOR_PART_PATTERN.findall(SELECTOR_NOISE_PATTERN.sub(' ', selector))}
+        if needed <= parts:
+            return True
+    return False
+
+
+def extract_critical_css(css, parts):
+    """Return the rules of ``css`` that apply to the elements in ``parts``, minified
+
+    Rules inside @media/@supports are filtered too. Other at-rules
+    (@font-face, @keyframes, ...) are always kept.
+    """
+    output = []
+    for prelude, block in parse_css_rules(css):
+        prelude = ' '.join(prelude.split())
+        if block is None:
+            output.append(f"{prelude};")
+        elif prelude.startswith(('@media', '@supports')):
+            inner = extract_critical_css(block, parts)
+            if inner:
+                output.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith('@') or selector_used(prelude, parts):
+            output.append(f"{prelude}{{{' '.join(block.split())}}}")
+    return ''.join(output)
+
+
+def above_fold_parts(doc):
+    """Collect the tag names, classes and ids of the elements above the fold
+
+    Returns None if the page has none of CRITICAL_ROOTS.
+    """
+    roots = [node for tag, attrs in CRITICAL_ROOTS for node in doc.find_all(tag, attrs)]
+    roots += doc.find_all('div', {'class': 'job-experience'})[:CRITICAL_ENTRIES]
+    if not roots:
+        return None
+    parts = set()
+    for root in roots:
+        ancestors = []
+        node = doc.parent(root)
+        while node is not None:
+            ancestors.append(node)
+            node = doc.parent(node)
+        for node in [root, *ancestors, *doc.descendants(root)]:
+            parts.add(doc.tag_name(node))
+            classes = doc.get_attr(node, 'class') or []
+            parts.update(f".{name}" for name in
+                         (classes.split() if isinstance(classes, str) else classes))
+            if doc.get_attr(node, 'id'):
+                parts.add(f"#{doc.get_attr(node, 'id')}")
+    return parts
+
+
+def inline_critical_css(doc, page, release_path, cache, used):
+    """Inline the above-the-fold rules of CRITICAL_STYLESHEETS into a parsed page
+
+    The full stylesheet is still loaded, but as a preload that is applied
+    once it arrives, with a <noscript> fallback. ``cache`` maps a hash of
+    the stylesheet and the page structure to rules extracted earlier; the
+    entries this page uses are added to ``used``. Returns
+    ``(blocking_bytes, inlined_bytes)``.
+    """
+    parts = above_fold_parts(doc)
+    if parts is None:
+        return 0, 0
+    page_dir = posixpath.dirname(page) or '.'
+    blocking_bytes = inlined_bytes = 0
+    for link in doc.find_all('link', {'rel': 'stylesheet', 'href': True}):
+        href = doc.get_attr(link, 'href')
+        name = posixpath.normpath(posixpath.join(page_dir, split_asset_ref(href)[0]))
+        plain = re.sub(r'\.[0-9a-f]{10}(\.[^.]+)$', r'\1', name)
+        if plain not in CRITICAL_STYLESHEETS or not (Path(release_path) / name).is_file():
+            continue
+        css = (Path(release_path) / name).read_text(encoding='utf-8')
+        key = content_hash([content_hash(css), sorted(parts)])
+        if key in cache:
+            used[key] = cache[key]
+        elif key not in used:
+            critical = extract_critical_css(css, parts)
+
+            def rebase(match):
+                ref = match.group(2)
+                if EXTERNAL_REF_PATTERN.match(ref):
+                    return match.group(0)
+                ref = posixpath.relpath(posixpath.join(posixpath.dirname(name), ref), page_dir)
+                return f"url({match.group(1)}{ref}{match.group(1)})"
+            used[key] = CSS_URL_PATTERN.sub(rebase, critical)
+
+        style = doc.new_element('style', text=used[key])
+        preload = doc.new_element('link', {
+            'as': 'style', 'href': href, 'rel': 'preload',
+            'onload': "this.onload=null;this.rel='stylesheet'",
+        })
+        noscript = doc.new_element('noscript')
+        doc.append(noscript, doc.new_element('link', {'href': href, 'rel': 'stylesheet'}))
+        doc.insert_after(link, [style, preload, noscript])
+        doc.remove(link)
+        blocking_bytes += len(css.encode('utf-8'))
+        inlined_bytes += len(used[key].encode('utf-8'))
+    return blocking_bytes, inlined_bytes
+
+
+def build_release(base_path=BASE_PATH, release_path=RELEASE_PATH, backend='html.parser',
+                  pages=RELEASE_PAGES, critical_css=True):
+    """Write a deployable copy of the site with fingerprinted assets and minified pages
+
+    Every local asset referenced by a page is copied as ``name.<hash>.ext``
+    and the references are rewritten in the parsed page, so the assets can
+    be cached as immutable. With ``critical_css`` the above-the-fold rules
+    are inlined and the stylesheet is loaded without blocking. The source
+    pages are never modified. Files left over from the previous release,
+    listed in its manifest, are removed.
+    Returns ``(files, stats)`` with the byte counts before and after.
+    """
+    base_path = Path(base_path).resolve()
+    release_path = Path(release_path)
+    release_path.mkdir(parents=True, exist_ok=True)
+    manifest_path = release_path / RELEASE_MANIFEST
+    try:
+        previous = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        previous = {}
+    critical_cache = previous.get('critical', {})
+    used_critical = {}
+    assets = {}
+    written = []
+    stats = dict.fromkeys(['html_bytes', 'minified_bytes', 'blocking_css_bytes',
+                           'inlined_css_bytes'], 0)
+
+    for page in pages:
+        page_path = base_path / page
+        if not page_path.is_file():
+            print(f"⚠ Warning: {page} not found - skipped")
+            continue
+        doc = load_document(page_path.read_text(encoding='utf-8'), backend)
+
+        def fingerprint_ref(ref):
+            target = local_asset(page_path.parent, ref)
+            if target is None or base_path not in target.parents:
+                return ref
+            name = fingerprint_asset(base_path, release_path, target, assets)
+            new_ref = posixpath.relpath(name, posixpath.dirname(page) or '.')
+            if ref.startswith('./'):
+                new_ref = f"./{new_ref}"
+            return new_ref + split_asset_ref(ref)[1]
+
+        for tag, attr in ASSET_REFERENCES:
+            for element in doc.find_all(tag, {attr: True}):
+                ref = doc.get_attr(element, attr)
+                if attr == 'srcset':
+                    candidates = [candidate.strip().split(None, 1) for candidate in ref.split(',')]
+                    new_ref = ', '.join(' '.join([fingerprint_ref(parts[0])] + parts[1:])
+                                        for parts in candidates if parts)
+                else:
+                    new_ref = fingerprint_ref(ref)
+                if new_ref != ref:
+                    doc.set_attr(element, attr, new_ref)
+
+        if critical_css:
+            blocking, inlined = inline_critical_css(doc, page, release_path,
+                                                    critical_cache, used_critical)
+            stats['blocking_css_bytes'] += blocking
+            stats['inlined_css_bytes'] += inlined
+
+        output = doc.serialize()
+        minified = minify_html(output)
+        stats['html_bytes'] += len(output.encode('utf-8'))
+        stats['minified_bytes'] += len(minified.encode('utf-8'))
+        (release_path / page).parent.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(release_path / page, minified)
+        written.append(page)
+
+    for name in RELEASE_DATA:
+        if (base_path / name).is_file():
+            shutil.copy2(base_path / name, release_path / name)
+            written.append(name)
+
+    files = sorted(written + list(assets.values())
+                   + [path.relative_to(base_path).as_posix() for path in assets])
+    for name in set(previous.get('files', [])) - set(files):
+        (release_path / name).unlink(missing_ok=True)
+    write_text_atomic(manifest_path, json.dumps({'files': files, 'critical': used_critical},
+                                                indent=2) + '\n')
+    return files, stats
+
+
+def run_release(release_path, backend='html.parser', base_path=BASE_PATH):
+    """Build the release and report what it wrote"""
+    print(f"\nBuilding release in {release_path}...")
+    files, stats = build_release(base_path, release_path, backend)
+    saved = stats['html_bytes'] - stats['minified_bytes']
+    print(f"✓ {len(files)} files written; HTML minified by {saved} bytes "
+          f"({saved / max(stats['html_bytes'], 1):.0%})")
+    if stats['blocking_css_bytes']:
+        saved = stats['blocking_css_bytes'] - stats['inlined_css_bytes']
+        print(f"✓ Critical CSS inlined: {stats['inlined_css_bytes']} bytes instead of "
+              f"{stats['blocking_css_bytes']} render-blocking bytes ({saved} saved)")
+
+
+# =============================================================================
+# Deploy
+# =============================================================================
+
+# Files served from the web root, relative to the site root. The .gz/.br
+# siblings of each file are deployed with it when they are up to date.
+DEPLOY_FILES = ['index.html', 'error404.html', 'custom.css', SEARCH_INDEX, 'js/*', 'img/*',
+                'icons/*']
+# A release is deployed whole, except for its dotfiles
+DEPLOY_RELEASE_FILES = ['**/*']
+DEPLOY_MANIFEST = '.deploy.json'
+DEPLOY_KEEP = 3
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def deploy_files(source, patterns=DEPLOY_FILES, compressed=None):
+    """Return ``{path: hash}`` for the files of ``source`` to deploy, by relative path
+
+    The .gz/.br siblings of a file are included only when ``compressed``, the
+    precompression cache, records the file's current hash. A sibling left
+    over from an older version of its file is never deployed.
+    """
+    source = Path(source)
+    compressed = compressed or {}
+    files = {}
+    for pattern in patterns:
+        for path in sorted(source.glob(pattern)):
+            name = path.relative_to(source).as_posix()
+            if (name in files or path.suffix in COMPRESSED_SUFFIXES or not path.is_file()
+                    or any(part.startswith('.') for part in name.split('/'))):
+                continue
+            files[name] = file_hash(path)
+            if compressed.get(name) != files[name]:
+                continue
+            for suffix in COMPRESSED_SUFFIXES:
+                sibling = path.with_name(path.name + suffix)
+                if sibling.is_file():
+                    files[name + suffix] = file_hash(sibling)
+    return dict(sorted(files.items()))
+
+
+def release_dir(target):
+    """Return the directory holding the releases of the web root ``target``"""
+    return target.with_name(f"{target.name}.releases")
+
+
+def switch_release(target, release_id):
+    """Point the web root ``target`` at a release in one atomic rename of a symlink"""
+    link = target.with_name(f".{target.name}.{release_id}.tmp")
+    os.symlink(posixpath.join(release_dir(target).name, release_id), link)
+    os.replace(link, target)
+
+
+def deploy_site(source, target, patterns=DEPLOY_FILES, keep=DEPLOY_KEEP, compressed=None):
+    """Publish the files of ``source`` to the web root ``target`` with an atomic switch
+
+    ``target`` is a symlink to the live release, a directory under
+    ``<target>.releases/`` whose DEPLOY_MANIFEST records the hash of every
+    file. A new release is staged next to it: files unchanged since the live
+    release are hard-linked from it, and only the changed ones are copied.
+    ``compressed`` is the precompression cache, see deploy_files().
+    The symlink is then replaced in one rename, so the web server never
+    serves a half-copied site. The newest ``keep`` releases are retained for
+    rollback_site(). Returns ``(release, copied, linked)`` with the copied file
+    names and the number of linked files, or None when ``target`` already
+    serves the same files.
+    """
+    source = Path(source)
+    target = Path(target)
+    if target.exists() and not target.is_symlink():
+        print(f"✗ {target} is a real directory; move it away once so it can become a symlink")
+        sys.exit(1)
+
+    live = target.resolve() if target.is_symlink() else None
+    try:
+        previous = json.loads((live / DEPLOY_MANIFEST).read_text(encoding='utf-8'))['files']
+    except (TypeError, OSError, ValueError, KeyError):
+        previous = {}
+    files = deploy_files(source, patterns, compressed)
+    if files == previous:
+        return None
+
+    releases = release_dir(target)
+    releases.mkdir(parents=True, exist_ok=True)
+    release_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+    suffix = 1
+    while (releases / release_id).exists():
+        suffix += 1
+        release_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{suffix}"
+
+    staging = releases / f".{release_id}.tmp"
+    copied = []
+    linked = 0
+    try:
+        for name, digest in files.items():
+            path = staging / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if previous.get(name) == digest:
+                try:
+                    os.link(live / name, path)
+                    linked += 1
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(source / name, path)
+            copied.append(name)
+        (staging / DEPLOY_MANIFEST).write_text(
+            json.dumps({'files': files}, indent=2) + '\n', encoding='utf-8')
+        os.replace(staging, releases / release_id)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    switch_release(target, release_id)
+
+    old = sorted(path for path in releases.iterdir()
+                 if path.is_dir() and not path.name.startswith('.'))[:-keep or None]
+    for path in old:
+        if path.name != release_id:
+            shutil.rmtree(path)
+    return release_id, copied, linked
+
+
+def run_deploy(source, target, release=False, compressed=None):
+    """Deploy the site, or a release built from it, and report what changed"""
+    print(f"\nDeploying {source} to {target}...")
+    patterns = DEPLOY_RELEASE_FILES if release else DEPLOY_FILES
+    result = deploy_site(source, target, patterns, compressed=compressed)
+    if result is None:
+        print(f"✓ {target} is up to date - nothing deployed")
+        return
+    release_id, copied, linked = result
+    print(f"✓ Release {release_id} is live: {len(copied)} of {len(copied) + linked} files "
+          f"copied, the unchanged ones hard-linked from the previous release")
+
+
+def rollback_site(target):
+    """Point the web root ``target`` back at the release before the live one
+
+    Returns ``(release, previous)``: the release that is now live and the
+    one it replaced.
+    """
+    target = Path(target)
+    if not target.is_symlink():
+        print(f"✗ {target} is not a deployed web root (no release symlink)")
+        sys.exit(1)
+    live = target.resolve().name
+    earlier = sorted(path.name for path in release_dir(target).iterdir()
+                     if path.is_dir() and not path.name.startswith('.') and path.name < live)
+    if not earlier:
+        print(f"✗ No release older than {live} in {release_dir(target)}")
+        sys.exit(1)
+    switch_release(target, earlier[-1])
+    return earlier[-1], live
+
+
+def run_rollback(target):
+    """Roll the web root back one release and report it"""
+    release_id, previous = rollback_site(target)
+    print(f"✓ {target} rolled back to release {release_id} (was {previous})")
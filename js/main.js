@@ -210,6 +210,59 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   });
 
+  // ===== SEARCH INDEX =====
+  // search-index.json is generated by the sync; it maps normalized terms to
+  // the data-id of the matching experience and education entries
+  let searchIndex = null;
+  const yearPattern = /^(19|20)\d\d$/;
+
+  function normalizeTerms(text) {
+    const folded = text.replace(/ł/g, 'l').replace(/Ł/g, 'L').replace(/ø/g, 'o')
+      .replace(/Ø/g, 'O').replace(/ß/g, 'ss').replace(/đ/g, 'd');
+    return folded.normalize('NFKD').replace(/[^\x00-\x7f]/g, '').toLowerCase()
+      .match(/[a-z0-9]+/g) || [];
+  }
+
+  // Words the indexer leaves out: stopwords, single characters and bare
+  // numbers other than years
+  function isIndexed(token) {
+    const stopwords = searchIndex.stopwords || [];
+    return token.length > 1 && !stopwords.includes(token)
+      && (!/^\d+$/.test(token) || yearPattern.test(token));
+  }
+
+  // Entries matching a word; an entry still running ("to": null) matches
+  // every year from its start up to the current one
+  function termIds(word) {
+    const ids = searchIndex.terms[word] || [];
+    if (!yearPattern.test(word)) return ids;
+    const year = Number(word);
+    const running = Object.entries(searchIndex.entries || {})
+      .filter(([id, entry]) => entry.to === null && entry.from !== null
+        && entry.from <= year && year <= new Date().getFullYear() && !ids.includes(id))
+      .map(([id]) => id);
+    return ids.concat(running);
+  }
+
+  // Resolve to the entry elements matching every indexed word of the query,
+  // or a whole skill phrase such as "jira confluence"
+  window.searchEntries = async (query) => {
+    if (!searchIndex) {
+      const response = await fetch('search-index.json');
+      searchIndex = response.ok ? await response.json() : { terms: {} };
+    }
+    const tokens = normalizeTerms(query);
+    const phrase = tokens.join(' ');
+    let ids = searchIndex.terms[phrase] && termIds(phrase);
+    if (!ids) {
+      const words = tokens.filter(isIndexed);
+      if (words.length === 0) return [];
+      ids = words.map(termIds)
+        .reduce((matches, next) => matches.filter(id => next.includes(id)));
+    }
+    return ids.map(id => document.querySelector(`[data-id="${id}"]`)).filter(Boolean);
+  };
+
   // ===== FORM VALIDATION (if email subject is needed) =====
   // Already handled in HTML with mailto link
 